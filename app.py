@@ -10,6 +10,8 @@ import os
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 import json
+from schema import migrate
+from job_record import to_epoch
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 app = Flask(__name__, 
@@ -33,41 +35,24 @@ def get_db():
 
 # Initialize database
 def init_db():
-    """Create database tables if they don't exist"""
-    with get_db() as conn:
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_id TEXT UNIQUE NOT NULL,
-                company TEXT NOT NULL,
-                title TEXT NOT NULL,
-                location TEXT,
-                url TEXT NOT NULL,
-                source_category TEXT NOT NULL,
-                description TEXT,
-                requirements TEXT,
-                posted_date TEXT,
-                scraped_date TEXT NOT NULL,
-                status TEXT DEFAULT 'pending',
-                match_score INTEGER,
-                gemini_analysis TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_source_category ON jobs(source_category)
-        ''')
-        
-        conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_status ON jobs(status)
-        ''')
-        
-        conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_company ON jobs(company)
-        ''')
-        
-        conn.commit()
+    """Apply pending schema migrations (run once, not per worker - see gunicorn.conf.py)"""
+    migrate(DATABASE_PATH)
+
+def parse_since(value: str) -> int:
+    """
+    Parse a date filter into epoch seconds
+    Accepts epoch seconds, an ISO date/datetime, or a relative age like 24h / 7d
+    """
+    value = value.strip().lower()
+    if value.isdigit():
+        return int(value)
+    if value[:-1].isdigit() and value[-1:] in ('h', 'd'):
+        hours = int(value[:-1]) * (24 if value.endswith('d') else 1)
+        return int((datetime.now() - timedelta(hours=hours)).timestamp())
+    epoch = to_epoch(value)
+    if epoch is None:
+        raise ValueError(f"Invalid date: {value}")
+    return epoch
 
 # API Routes
 
@@ -80,23 +65,46 @@ def index():
 def get_jobs():
     """
     Get filtered jobs with pagination
-    Query params: search, source, status, page, per_page
+    Query params: search, source, status, classification, rule, profile,
+                  since, posted_after, page, per_page
+    
+    With profile, classification/rule apply to that profile's stored
+    result (default: jobs the profile keeps) instead of the combined one.
     """
     try:
         # Get query parameters
         search = request.args.get('search', '')
         source = request.args.get('source', 'all')
         status = request.args.get('status', 'all')
+        classification = request.args.get('classification', 'all')
+        rule = request.args.get('rule', 'all')
+        profile = request.args.get('profile', '')
+        since = request.args.get('since', '')
+        posted_after = request.args.get('posted_after', '')
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 50))
         
         offset = (page - 1) * per_page
         
         with get_db() as conn:
-            # Build query
-            query = 'SELECT * FROM jobs WHERE 1=1'
+            # Build query (shared by the page and count queries)
+            columns = '*'
+            query = ' FROM jobs WHERE 1=1'
             params = []
             
+            # Per-profile results (see profiles.py) replace the combined decision
+            if profile:
+                columns = ('jobs.*, p.decision AS profile_decision, '
+                           'p.rule AS profile_rule, p.reason AS profile_reason')
+                query = (' FROM jobs JOIN job_profiles p ON p.job_id = jobs.job_id'
+                         ' AND p.profile = ? WHERE 1=1')
+                params.append(profile)
+                decision_column, rule_column = 'p.decision', 'p.rule'
+                if classification == 'all':
+                    classification = 'keep'
+            else:
+                decision_column, rule_column = 'filter_decision', 'filter_rule'
+            
             # Search filter
             if search:
                 query += ' AND (title LIKE ? OR company LIKE ? OR location LIKE ?)'
@@ -113,24 +121,41 @@ def get_jobs():
                 query += ' AND status = ?'
                 params.append(status)
             
-            # Order by scraped date (newest first)
-            query += ' ORDER BY scraped_date DESC LIMIT ? OFFSET ?'
-            params.extend([per_page, offset])
+            # Stored filter classification (see reclassify.py)
+            if classification == 'unclassified':
+                query += f' AND {decision_column} IS NULL'
+            elif classification != 'all':
+                query += f' AND {decision_column} = ?'
+                params.append(classification)
             
-            # Execute query
-            cursor = conn.execute(query, params)
+            if rule != 'all':
+                query += f' AND {rule_column} = ?'
+                params.append(rule)
+            
+            # Date-range filters on indexed epoch columns
+            try:
+                if since:
+                    query += ' AND scraped_ts >= ?'
+                    params.append(parse_since(since))
+                if posted_after:
+                    query += ' AND posted_ts >= ?'
+                    params.append(parse_since(posted_after))
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            
+            # A job is new if it was scraped today (computed in SQL)
+            today_start = int(datetime.combine(datetime.now().date(), datetime.min.time()).timestamp())
+            
+            # Order by scraped date (newest first)
+            cursor = conn.execute(
+                f'SELECT {columns}, scraped_ts >= ? AS is_new' + query +
+                ' ORDER BY scraped_ts DESC LIMIT ? OFFSET ?',
+                [today_start, *params, per_page, offset]
+            )
             jobs = [dict(row) for row in cursor.fetchall()]
             
             # Get total count for pagination
-            count_query = query.split('ORDER BY')[0].replace('SELECT *', 'SELECT COUNT(*)')
-            count_params = params[:-2]  # Exclude LIMIT and OFFSET
-            total = conn.execute(count_query, count_params).fetchone()[0]
-            
-            # Check if job is new (posted today)
-            today = datetime.now().date()
-            for job in jobs:
-                scraped = datetime.fromisoformat(job['scraped_date']).date()
-                job['is_new'] = (today - scraped).days == 0
+            total = conn.execute('SELECT COUNT(*)' + query, params).fetchone()[0]
             
             return jsonify({
                 'success': True,
@@ -183,6 +208,74 @@ def get_sources():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/profiles', methods=['GET'])
+def get_profiles():
+    """Filter profiles with stored results and how many jobs each keeps"""
+    try:
+        with get_db() as conn:
+            cursor = conn.execute('''
+                SELECT profile, SUM(decision = 'keep') AS kept, COUNT(*) AS total
+                FROM job_profiles GROUP BY profile ORDER BY profile
+            ''')
+            profiles = [dict(row) for row in cursor.fetchall()]
+            
+            return jsonify({
+                'success': True,
+                'profiles': profiles
+            })
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/changes', methods=['GET'])
+def get_changes():
+    """
+    Feed of postings added, reopened or closed since a point in time
+    Query params: since (epoch, ISO date or 24h/7d; default 24h), company, limit
+    """
+    try:
+        try:
+            since = parse_since(request.args.get('since', '24h'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        company = request.args.get('company', '')
+        limit = min(int(request.args.get('limit', 500)), 5000)
+        
+        with get_db() as conn:
+            query = ' WHERE run_ts >= ?'
+            params = [since]
+            if company:
+                query += ' AND company = ?'
+                params.append(company)
+            
+            # Per-company summary of each scrape run
+            runs = [dict(row) for row in conn.execute(
+                'SELECT company, run_ts, added, removed, reopened, unchanged, complete '
+                'FROM company_diffs' + query + ' ORDER BY run_ts DESC, company',
+                params
+            )]
+            
+            # Individual postings that changed, oldest first
+            events = [dict(row) for row in conn.execute(
+                'SELECT e.id, e.ts, e.company, e.event, e.job_id, j.id AS job_row_id, '
+                'j.title, j.location, j.url '
+                'FROM job_events e LEFT JOIN jobs j ON j.job_id = e.job_id '
+                'WHERE e.ts >= ?' + (' AND e.company = ?' if company else '') +
+                ' ORDER BY e.id LIMIT ?',
+                [*params, limit]
+            )]
+            
+            return jsonify({
+                'success': True,
+                'since': since,
+                'runs': runs,
+                'events': events,
+                'truncated': len(events) == limit
+            })
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/jobs/<int:job_id>/status', methods=['PUT'])
 def update_job_status(job_id):
     """Update job application status"""
@@ -226,10 +319,8 @@ def not_found(e):
 def server_error(e):
     return jsonify({'success': False, 'error': 'Internal server error'}), 500
 
-# Initialize database on startup
-init_db()
-
 if __name__ == '__main__':
+    init_db()
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_ENV') == 'development'
     app.run(host='0.0.0.0', port=port, debug=debug)
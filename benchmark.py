@@ -0,0 +1,271 @@
+"""
+Performance Benchmarks
+Measures cold-start cost of the web app and scraper entry points,
+per-job memory / filter cost of the scraper pipeline, how filtering scales
+with the number of profiles, and bulk reclassification throughput over
+the stored table
+
+Usage: python benchmark.py
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+import subprocess
+import statistics
+import tracemalloc
+from typing import Dict
+
+RUNS = int(os.getenv('BENCHMARK_RUNS', 5))
+PIPELINE_JOBS = int(os.getenv('BENCHMARK_JOBS', 50000))
+RECLASSIFY_ROWS = int(os.getenv('BENCHMARK_RECLASSIFY_ROWS', 1000000))
+
+
+def _time_subprocess(code: str, env: Dict = None) -> float:
+    """Median wall-clock seconds to run `python -c code` in a fresh interpreter"""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, env=env,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_startup() -> Dict[str, float]:
+    """Cold import time of each entry point plus migration cost"""
+    from schema import migrate
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jobs.db')
+        env = dict(os.environ, DATABASE_PATH=db_path)
+
+        results['python baseline'] = _time_subprocess('pass', env)
+        results['import app (web worker boot)'] = _time_subprocess('import app', env)
+        results['import gemini_scraper'] = _time_subprocess('import gemini_scraper', env)
+
+        start = time.perf_counter()
+        migrate(db_path)
+        results['migrate (fresh database)'] = time.perf_counter() - start
+
+        conn = sqlite3.connect(db_path)
+        start = time.perf_counter()
+        migrate(conn)
+        results['migrate (up to date)'] = time.perf_counter() - start
+        conn.close()
+
+    return results
+
+
+def _sample_jobs(count: int):
+    """Synthetic extracted jobs as the pre-JobRecord pipeline built them"""
+    titles = ['Software Engineer II', 'Senior Data Scientist', 'Quant Analyst',
+              'ML Engineer Intern', 'Sales Manager', 'Associate, Technology']
+    locations = ['Austin, TX', 'London, UK', 'Remote', 'New York, NY', 'Toronto']
+    descriptions = ['5+ years of experience in Python', 'Entry level role on our team',
+                    '2-4 years experience with SQL', 'Join a great team']
+    companies = ['Amazon', 'Google', 'JPMorgan Chase', 'Shell']
+    return [{
+        'job_id': f'job_{i}',
+        'company': ''.join(companies[i % 4]),  # fresh string per job, as from JSON
+        'title': titles[i % 6],
+        'location': ''.join(locations[i % 5]),
+        'url': f'https://example.com/jobs/{i}',
+        'source_category': ''.join('MAANG'),
+        'description': descriptions[i % 4],
+        'posted_date': '',
+        'scraped_date': ''.join('2026-01-01T00:00:00'),
+    } for i in range(count)]
+
+
+def _stored_jobs(count: int):
+    """
+    Synthetic stored jobs with real-world cardinality
+
+    Titles are composed from level/role/team parts (about a third carry a
+    requisition number), locations come from a few hundred variants and
+    every description is distinct, so the column scanners' per-value
+    dedupe can't hide the scan cost.
+    """
+    rng = random.Random(0)
+    levels = ['', 'Junior ', 'Senior ', 'Staff ', 'Principal ', 'Lead ', 'Associate ',
+              'Graduate ', 'Entry Level ', 'Sr. ']
+    roles = ['Software Engineer', 'Data Scientist', 'Quant Analyst', 'ML Engineer',
+             'Backend Developer', 'Sales Manager', 'Product Manager', 'Data Engineer',
+             'Site Reliability Engineer', 'Accountant', 'Recruiter', 'Technology Analyst',
+             'Frontend Engineer', 'Research Scientist', 'Business Analyst',
+             'Security Engineer', 'Operations Associate', 'Full Stack Developer',
+             'Mobile Engineer', 'Customer Success Manager']
+    teams = ['', ', Payments', ', Ads', ', Cloud', ', Risk', ', Trading', ', Platform',
+             ', Search', ', Infrastructure', ', Retail', ' II', ' III', ' (Intern)',
+             ' - Summer 2026', ', Machine Learning', ', Core Banking']
+    cities = ['Austin', 'Seattle', 'New York', 'San Francisco', 'Chicago', 'Boston',
+              'Dallas', 'Atlanta', 'Denver', 'London', 'Toronto', 'Bangalore', 'Dublin',
+              'Singapore', 'Houston', 'Phoenix', 'Columbus', 'Charlotte', 'Jersey City',
+              'Plano', 'Remote']
+    regions = ['TX', 'WA', 'NY', 'CA', 'IL', 'MA', 'GA', 'CO', 'UK', 'Canada', 'India',
+               'Ireland', 'United States', 'USA', 'OH', 'NC', 'NJ', 'AZ']
+    sentences = ['We are looking for an engineer to join our {team} team.',
+                 'You will build services used by {n} million customers.',
+                 'Requires {y}+ years of experience with Python or Java.',
+                 'Entry level candidates and new graduates are welcome.',
+                 'Experience with SQL and distributed systems is a plus.',
+                 'Minimum {y} years of professional experience required.',
+                 'Work with product managers to ship features every week.',
+                 'Competitive salary, equity and benefits.',
+                 'This role is hybrid, {d} days a week in the office.']
+    companies = ['Amazon', 'Google', 'JPMorgan Chase', 'Shell', 'Microsoft', 'Goldman Sachs',
+                 'Meta', 'Apple', 'Netflix', 'Morgan Stanley', 'BP', 'Citadel']
+    jobs = []
+    for i in range(count):
+        title = rng.choice(levels) + rng.choice(roles) + rng.choice(teams)
+        if rng.random() < 0.35:
+            title += f' (R{rng.randrange(100000, 999999)})'
+        description = ' '.join(
+            sentence.format(team=rng.choice(roles), n=rng.randrange(1, 500),
+                            y=rng.randrange(1, 12), d=rng.randrange(2, 5))
+            for sentence in rng.sample(sentences, rng.randrange(3, 7)))
+        jobs.append({
+            'job_id': f'job_{i}',
+            'company': rng.choice(companies),
+            'title': title,
+            'location': f'{rng.choice(cities)}, {rng.choice(regions)}',
+            'url': f'https://example.com/jobs/{i}',
+            'source_category': 'MAANG',
+            'description': f'{description} Ref {i}.',
+            'scraped_date': '2026-01-01T00:00:00',
+        })
+    return jobs
+
+
+def bench_pipeline() -> Dict[str, float]:
+    """Per-job memory and ProfileMatcher throughput for dict jobs vs JobRecord"""
+    from job_record import JobRecord
+    from profiles import ProfileMatcher, load_profiles
+
+    matcher = ProfileMatcher(load_profiles())
+    results = {}
+
+    tracemalloc.start()
+    jobs = _sample_jobs(PIPELINE_JOBS)
+    results['dict job memory (bytes/job)'] = tracemalloc.get_traced_memory()[0] / PIPELINE_JOBS
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    records = [JobRecord.from_dict(job) for job in _sample_jobs(PIPELINE_JOBS)]
+    results['JobRecord memory (bytes/job)'] = tracemalloc.get_traced_memory()[0] / PIPELINE_JOBS
+    tracemalloc.stop()
+
+    # Dicts are coerced to a fresh JobRecord on every call, so nothing
+    # normalized is kept between passes
+    start = time.perf_counter()
+    for job in jobs:
+        matcher.classify(job)
+    results['classify dict (us/job)'] = (time.perf_counter() - start) / PIPELINE_JOBS * 1e6
+
+    start = time.perf_counter()
+    for job in records:
+        matcher.apply(job)
+    results['apply JobRecord first pass (us/job)'] = (time.perf_counter() - start) / PIPELINE_JOBS * 1e6
+
+    start = time.perf_counter()
+    for job in records:
+        matcher.apply(job)
+    results['apply JobRecord re-filter (us/job)'] = (time.perf_counter() - start) / PIPELINE_JOBS * 1e6
+
+    return results
+
+
+def bench_reclassify() -> Dict[str, float]:
+    """Full-table reclassification of RECLASSIFY_ROWS stored jobs"""
+    from schema import migrate
+    from reclassify import reclassify
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jobs.db')
+        migrate(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.executemany('''
+            INSERT INTO jobs (job_id, company, title, location, url,
+                              source_category, description, scraped_date)
+            VALUES (:job_id, :company, :title, :location, :url,
+                    :source_category, :description, :scraped_date)
+        ''', _stored_jobs(RECLASSIFY_ROWS))
+        conn.commit()
+        conn.close()
+
+        result = reclassify(db_path)
+        results['first run, all rows written (s)'] = result['elapsed']
+        result = reclassify(db_path)
+        results['re-run, nothing changed (s)'] = result['elapsed']
+        results['re-run throughput (k rows/s)'] = result['rows_per_second'] / 1000
+
+    return results
+
+
+def _distinct_profiles(count: int) -> Dict[str, Dict]:
+    """`count` different profiles: rotating slices of the built-in keyword sets plus literals"""
+    from profiles import KEYWORD_SETS
+
+    usa, tech, entry = (sorted(KEYWORD_SETS[name]) for name in ('usa', 'tech', 'entry_level'))
+    profiles = {}
+    for i in range(count):
+        profile = {
+            'locations': usa[i % 7::3] + ['london', 'toronto'][:i % 3],
+            'titles': tech[i % 5::2] + [f'role {i}'],
+        }
+        if i % 4 != 3:  # every fourth profile has no experience rule
+            profile['experience'] = entry[i % 3::2]
+        profiles[f'profile_{i}'] = profile
+    return profiles
+
+
+def bench_profiles() -> Dict[str, float]:
+    """Filter cost per job as distinct profiles are added: one matcher per profile vs one shared"""
+    from job_record import JobRecord
+    from profiles import ProfileMatcher
+
+    records = [JobRecord.from_dict(job) for job in _sample_jobs(PIPELINE_JOBS)]
+    results = {}
+
+    for count in (1, 4, 16):
+        profiles = _distinct_profiles(count)
+
+        separate = [ProfileMatcher({name: rules}) for name, rules in profiles.items()]
+        start = time.perf_counter()
+        for job in records:
+            for matcher in separate:
+                matcher.classify(job)
+        results[f'{count} profiles, matcher per profile (us/job)'] = \
+            (time.perf_counter() - start) / PIPELINE_JOBS * 1e6
+
+        matcher = ProfileMatcher(profiles)
+        start = time.perf_counter()
+        for job in records:
+            matcher.classify(job)
+        results[f'{count} profiles, shared matcher (us/job)'] = \
+            (time.perf_counter() - start) / PIPELINE_JOBS * 1e6
+
+    return results
+
+
+def _print_section(title: str, results: Dict[str, float], unit: str = 'ms'):
+    print(f"\n{'='*60}")
+    print(title)
+    print(f"{'='*60}")
+    for name, value in results.items():
+        value = value * 1000 if unit == 'ms' else value
+        print(f"{name:<40} {value:>10.1f} {unit}")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    _print_section('Startup', bench_startup())
+    _print_section(f'Pipeline ({PIPELINE_JOBS} jobs)', bench_pipeline(), unit='')
+    _print_section(f'Profiles ({PIPELINE_JOBS} jobs)', bench_profiles(), unit='')
+    _print_section(f'Reclassify ({RECLASSIFY_ROWS} rows)', bench_reclassify(), unit='')
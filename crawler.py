@@ -0,0 +1,370 @@
+"""
+Pagination-Aware Crawler
+Follows listing pagination ("next" links, page/offset parameters, "load
+more" endpoints) for every configured career URL. Listings on different
+hosts are crawled concurrently with a per-host request limit, and a listing
+stops early once a page holds only jobs seen on earlier runs. Requests go
+through per-host circuit breakers with latency-based timeouts (host_health.py)
+"""
+
+import os
+import re
+import time
+import html
+import sqlite3
+import threading
+from contextlib import contextmanager
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, urlunparse
+
+from job_record import JobRecord
+from host_health import HostHealth
+from page_store import PageStore
+
+DEFAULT_MAX_PAGES = int(os.getenv('MAX_PAGES', 5))
+SCRAPER_WORKERS = int(os.getenv('SCRAPER_WORKERS', 4))
+PER_HOST_LIMIT = int(os.getenv('PER_HOST_LIMIT', 1))
+REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', 2))  # seconds between requests to a host
+
+# Query parameters career sites commonly paginate with: page numbers
+# (first page = 1) and result offsets (first page = 0)
+PAGE_NUMBER_PARAMS = ('page', 'p', 'pg', 'pagenumber', 'page_number')
+OFFSET_PARAMS = ('offset', 'start', 'from', 'startrow', 'skip')
+PAGE_PARAMS = PAGE_NUMBER_PARAMS + OFFSET_PARAMS
+CURSOR_PARAMS = ('cursor', 'after', 'next', 'continuation', 'pagetoken', 'page_token')
+
+NEXT_LINK_PATTERN = re.compile(
+    r'<(?:a|link)\b[^>]*\brel\s*=\s*["\']?next\b[^>]*>', re.IGNORECASE)
+HREF_PATTERN = re.compile(r'\bhref\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+# JSON state or data attributes pointing at the next page / "load more" API.
+# Only pagination-specific names: a bare "next" key or data-url attribute is
+# as likely to point at a job detail page
+NEXT_ENDPOINT_PATTERN = re.compile(
+    r'(?:"(?:nextPage|next_page|nextPageUrl|next_page_url|nextUrl|next_url|loadMoreUrl)"\s*:\s*'
+    r'|data-(?:next-url|next-page-url|load-more-url)\s*=\s*)["\']([^"\']+)["\']',
+    re.IGNORECASE)
+CANDIDATE_URL_PATTERN = re.compile(
+    r'(?:href|data-[\w-]+)\s*=\s*["\']([^"\']*[?&](?:%s)=\d+[^"\']*)["\']'
+    % '|'.join(PAGE_PARAMS), re.IGNORECASE)
+
+
+class HostLimiter:
+    """Caps concurrent requests per host and spaces them REQUEST_DELAY apart"""
+
+    def __init__(self, per_host: int = PER_HOST_LIMIT, delay: float = REQUEST_DELAY):
+        self.delay = delay
+        self._semaphores = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._last_request = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url: str):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores[host]
+        with semaphore:
+            with self._lock:
+                wait = self._last_request.get(host, 0) + self.delay - time.monotonic()
+                self._last_request[host] = time.monotonic() + max(wait, 0)
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+
+def set_query_param(url: str, param: str, value) -> str:
+    """Return `url` with query parameter `param` set to `value`"""
+    parts = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != param]
+    query.append((param, str(value)))
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+def _page_value(url: str, param: str) -> Optional[int]:
+    for key, value in parse_qsl(urlparse(url).query):
+        if key.lower() == param and value.isdigit():
+            return int(value)
+    return None
+
+
+def _resolve(page_url: str, href: str) -> Optional[str]:
+    """Absolute URL for a link found on a page, or None if it is malformed"""
+    try:
+        url = urljoin(page_url, html.unescape(href))
+        urlparse(url).netloc  # raises on e.g. an unbalanced "[" in the host
+    except ValueError:
+        return None
+    return url
+
+
+def _is_listing_page(candidate: str, page_url: str) -> bool:
+    """
+    Whether a discovered URL plausibly continues the listing: same host, and
+    either the listing's path or a paging/cursor query parameter
+    """
+    candidate_parts, page_parts = urlparse(candidate), urlparse(page_url)
+    if candidate_parts.netloc != page_parts.netloc:
+        return False
+    if candidate_parts.path.rstrip('/') == page_parts.path.rstrip('/'):
+        return True
+    params = {key.lower() for key, _ in parse_qsl(candidate_parts.query)}
+    return bool(params & (set(PAGE_PARAMS) | set(CURSOR_PARAMS)))
+
+
+def find_next_page_url(page_html: str, page_url: str) -> Optional[str]:
+    """
+    Discover the next listing page from the page itself
+
+    Tries, in order: rel="next" links, next-page/"load more" endpoints in
+    embedded JSON or data attributes that stay on the listing's path or carry
+    a paging/cursor parameter, then same-host links whose paging parameter is
+    the smallest value beyond the current page's.
+    """
+    for tag in NEXT_LINK_PATTERN.findall(page_html):
+        href = HREF_PATTERN.search(tag)
+        next_url = href and _resolve(page_url, href.group(1))
+        if next_url:
+            return next_url
+
+    host = urlparse(page_url).netloc
+    for match in NEXT_ENDPOINT_PATTERN.finditer(page_html):
+        if '/' not in match.group(1) and '?' not in match.group(1):
+            continue
+        next_url = _resolve(page_url, match.group(1).replace('\\/', '/'))
+        if next_url and _is_listing_page(next_url, page_url):
+            return next_url
+
+    best = None
+    for candidate in CANDIDATE_URL_PATTERN.findall(page_html):
+        candidate = _resolve(page_url, candidate)
+        if candidate is None or urlparse(candidate).netloc != host:
+            continue
+        for param in PAGE_PARAMS:
+            value = _page_value(candidate, param)
+            if value is None:
+                continue
+            current = _page_value(page_url, param)
+            if current is None:
+                current = 1 if param in PAGE_NUMBER_PARAMS else 0
+            if value > current and (best is None or value < best[0]):
+                best = (value, candidate)
+    return best[1] if best else None
+
+
+def next_page_url(listing_url: str, page_url: str, page_html: str,
+                  page_index: int, rule: Dict) -> Optional[str]:
+    """
+    URL of listing page `page_index` (0-based)
+
+    A configured rule ({"param": "offset", "start": 0, "step": 10}) builds
+    the URL directly; otherwise the link is discovered from the page HTML.
+    """
+    if rule.get('param'):
+        value = rule.get('start', 1) + rule.get('step', 1) * page_index
+        return set_query_param(listing_url, rule['param'], value)
+    return find_next_page_url(page_html, page_url)
+
+
+class ListingCrawler:
+    """
+    Crawls one career listing across its pages
+
+    Pages of a listing are fetched in order, because whether to continue
+    depends on the jobs extracted from the previous page.
+    """
+
+    def __init__(self, scraper, pagination: Dict = None,
+                 known_fingerprints: Dict[str, Set[str]] = None,
+                 limiter: HostLimiter = None, health: HostHealth = None,
+                 page_store: PageStore = None, full_crawl: Set[str] = None):
+        self.scraper = scraper
+        self.pagination = pagination or {}
+        self.known_fingerprints = known_fingerprints or {}
+        self.full_crawl = full_crawl or set()  # companies not stopped at known jobs
+        self.limiter = limiter or HostLimiter()
+        self.health = health or HostHealth()
+        self.page_store = page_store
+
+    def crawl(self, url: str, company: str, source_category: str) -> Dict:
+        """
+        Returns:
+            Dictionary with jobs, pages fetched and stop_reason: 'end' (no
+            further page), 'known' (page held only known jobs), 'cap'
+            (max_pages reached), 'error', 'extract_error' (extraction failed
+            or was truncated), 'empty' (first page yielded no jobs although
+            the company had some before, e.g. a captcha page), 'circuit_open'
+            (host skipped while failing) or 'backoff' (listing skipped until
+            its next retry), plus the pages kept in the raw page store (if
+            enabled). Only 'end' means every posting of the listing was seen.
+        """
+        rule = self.pagination.get(company, {})
+        max_pages = rule.get('max_pages', DEFAULT_MAX_PAGES)
+        known = self.known_fingerprints.get(company, set())
+
+        jobs: List[JobRecord] = []
+        stored_pages = []
+        seen = set()
+        visited = set()
+        page_url = url
+        pages = 0
+        stop_reason = 'end'
+
+        # A listing that keeps failing is only retried on its backoff schedule
+        if not self.health.url_due(url):
+            page_url = None
+            stop_reason = 'backoff'
+
+        while page_url:
+            if pages >= max_pages:
+                stop_reason = 'cap'
+                break
+            visited.add(page_url)
+
+            # Checked again after waiting for the host slot, in case another
+            # listing on the same host tripped the circuit meanwhile
+            if not self.health.allow(page_url):
+                stop_reason = 'circuit_open'
+                break
+            try:
+                with self.limiter.slot(page_url):
+                    if self.health.is_open(page_url):
+                        stop_reason = 'circuit_open'
+                        break
+                    started = time.monotonic()
+                    page_html = self.scraper.fetch_page(
+                        page_url, timeout=self.health.timeout(page_url))
+            except Exception as e:
+                print(f"Error scraping {page_url}: {e}")
+                self.health.record_failure(page_url, e)
+                if pages == 0:
+                    self.health.record_url(url, e)
+                stop_reason = 'error'
+                break
+            self.health.record_success(page_url, time.monotonic() - started)
+            if pages == 0:
+                self.health.record_url(url)
+            if self.page_store:
+                try:
+                    stored_pages.append((page_url, self.page_store.put(page_html), url,
+                                         company, source_category, pages))
+                except OSError as e:
+                    # The page store only serves replays; the crawl goes on
+                    print(f"Error storing {page_url}: {e}")
+            pages += 1
+
+            # Anything unexpected while handling the page ends this listing
+            # only; jobs from earlier pages are kept
+            try:
+                # Fallback job URLs resolve to the listing URL, not the page URL,
+                # so fingerprints don't change when a posting moves between pages
+                extracted = self.scraper.extract_jobs_with_gemini(
+                    page_html, company, source_category, url)
+                page_jobs = [job for job in extracted if job.fingerprint not in seen]
+                next_url = next_page_url(url, page_url, page_html, pages, rule)
+            except Exception as e:
+                print(f"Error processing {page_url}: {e}")
+                stop_reason = 'error'
+                break
+            seen.update(job.fingerprint for job in page_jobs)
+            jobs.extend(page_jobs)
+            # Jobs parsed from a failed extraction are kept, but the rest of
+            # the page (and the listing after it) is unknown
+            if not extracted.complete:
+                stop_reason = 'extract_error'
+                break
+            if not page_jobs:
+                if pages == 1 and known:
+                    stop_reason = 'empty'
+                break
+
+            if next_url is None or next_url in visited:
+                break
+
+            # Only an actual remaining page makes this an early stop
+            if company not in self.full_crawl and all(
+                    job.fingerprint in known for job in page_jobs):
+                stop_reason = 'known'
+                break
+            page_url = next_url
+
+        return {
+            'url': url,
+            'company': company,
+            'source_category': source_category,
+            'jobs': jobs,
+            'pages': pages,
+            'stop_reason': stop_reason,
+            'stored_pages': stored_pages,
+        }
+
+
+def crawl_sources(sources_config: Dict, scraper, pagination: Dict = None,
+                  known_fingerprints: Dict[str, Set[str]] = None,
+                  workers: int = SCRAPER_WORKERS,
+                  health: HostHealth = None,
+                  page_store: PageStore = None,
+                  full_crawl: Set[str] = None) -> Iterator[Dict]:
+    """
+    Crawl every configured URL concurrently, yielding each listing's result as it finishes
+
+    Listings are submitted healthiest first, so failing hosts and URLs
+    cannot hold up the rest of the run. Listings of companies in
+    `full_crawl` run past pages of known postings (up to max_pages).
+    """
+    health = health or HostHealth()
+    crawler = ListingCrawler(scraper, pagination, known_fingerprints, health=health,
+                             page_store=page_store, full_crawl=full_crawl)
+    listings = sorted(
+        ((url, company_name, source_name)
+         for source_name, source_data in sources_config.items()
+         for company_name, career_urls in source_data.get('companies', {}).items()
+         for url in career_urls),
+        key=lambda listing: health.rank(listing[0]))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(crawler.crawl, *listing): listing for listing in listings}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # A listing that fails outside the page loop must not sink the run
+                url, company, source_category = futures[future]
+                print(f"Error crawling {url}: {e}")
+                yield {'url': url, 'company': company, 'source_category': source_category,
+                       'jobs': [], 'pages': 0, 'stop_reason': 'error', 'stored_pages': []}
+
+
+def load_known_fingerprints(conn: sqlite3.Connection) -> Dict[str, Set[str]]:
+    """Fingerprints of every posting seen on earlier runs, by company"""
+    known = defaultdict(set)
+    for company, fingerprint in conn.execute('SELECT company, fingerprint FROM job_fingerprints'):
+        known[company].add(fingerprint)
+    return known
+
+
+def record_fingerprints(conn: sqlite3.Connection, jobs: List[JobRecord]):
+    """Remember every extracted posting (kept or filtered out) for early stopping"""
+    now = datetime.now().isoformat()
+    with conn:
+        conn.executemany('''
+            INSERT INTO job_fingerprints (fingerprint, company, first_seen, last_seen)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(fingerprint) DO UPDATE SET last_seen = excluded.last_seen
+        ''', [(job.fingerprint, job.company, now, now) for job in jobs])
+
+
+def prune_fingerprints(conn: sqlite3.Connection, cutoff: datetime) -> int:
+    """
+    Forget postings not extracted since `cutoff`
+
+    A forgotten posting that shows up again just counts as new, so the
+    listing is crawled further instead of stopping early.
+
+    Returns:
+        Number of fingerprints removed
+    """
+    with conn:
+        return conn.execute('DELETE FROM job_fingerprints WHERE last_seen < ?',
+                            (cutoff.isoformat(),)).rowcount
@@ -4,23 +4,89 @@ Uses Google's Gemini API to intelligently extract and analyze job postings
 """
 
 import os
-import requests
 import sqlite3
 from datetime import datetime
-import json
+import re
 import time
-from typing import List, Dict, Optional
-import google.generativeai as genai
-from jobfilter import JobFilter  # ✅ IMPORT ADDED
+import threading
+from typing import List, Dict, Iterator, Optional
+from urllib.parse import urljoin
+from profiles import ProfileMatcher, load_profiles
+from job_record import ExtractedJobs, JobRecord, to_epoch
+from json_stream import JsonObjectStream, iter_json_objects, parse_first_object
+from schema import migrate
+from crawler import crawl_sources, load_known_fingerprints, record_fingerprints
+from host_health import HostHealth
+from page_store import get_page_store, record_pages
+from job_diff import CompanyRun, companies_due_full_crawl, diff_company, record_diff
 
 # Configure Gemini
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-2.0-flash-exp')
+GEMINI_MODEL_NAME = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash-exp')
 
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'jobs.db')
 
+# Extracted job fields → max length (all strings)
+JOB_SCHEMA = {
+    'title': 200,
+    'location': 200,
+    'url': 2000,
+    'posted_date': 10,
+    'description': 200,
+}
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+REQUEST_TIMEOUT = 30
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_gemini_model():
+    """
+    Return the shared Gemini model, importing and configuring the SDK on
+    first use so runs that never call Gemini don't pay for it
+    """
+    global _model
+    if _model is None and GEMINI_API_KEY:
+        with _model_lock:  # crawler threads may race to the first call
+            if _model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=GEMINI_API_KEY)
+                _model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _model
+
+
+def validate_job_data(job_data, base_url: str) -> Optional[Dict]:
+    """
+    Check one extracted job object against JOB_SCHEMA
+    
+    Returns:
+        Cleaned field dict, or None if the object is not a usable job
+    """
+    if not isinstance(job_data, dict):
+        return None
+    
+    job = {}
+    for field, max_length in JOB_SCHEMA.items():
+        value = job_data.get(field)
+        job[field] = '' if value is None else str(value).strip()[:max_length]
+    
+    if not job['title']:
+        return None
+    if not job['location']:
+        job['location'] = 'Not specified'
+    # Relative or missing links resolve against the career page
+    job['url'] = urljoin(base_url, job['url']) if job['url'] else base_url
+    if not DATE_PATTERN.match(job['posted_date']):
+        job['posted_date'] = ''
+    
+    return job
+
 
 class GeminiJobScraper:
     """
@@ -28,10 +94,11 @@ class GeminiJobScraper:
     from career pages and analyze job descriptions
     """
     
-    def __init__(self):
-        self.model = model if GEMINI_API_KEY else None
+    @property
+    def model(self):
+        return get_gemini_model()
         
-    def scrape_jobs_from_url(self, url: str, company: str, source_category: str) -> List[Dict]:
+    def scrape_jobs_from_url(self, url: str, company: str, source_category: str) -> List[JobRecord]:
         """
         Scrape jobs from a career page URL using Gemini to extract structured data
         
@@ -41,44 +108,76 @@ class GeminiJobScraper:
             source_category: Source category (e.g., MAANG, ENERGY, BFSI)
         
         Returns:
-            List of job dictionaries
+            List of JobRecord
         """
         try:
-            # Fetch the page content
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # Get the HTML content
-            html_content = response.text
-            
-            # Use Gemini to extract job listings
-            jobs = self.extract_jobs_with_gemini(html_content, company, source_category, url)
-            
-            return jobs
+            # Fetch the page content and use Gemini to extract job listings
+            html_content = self.fetch_page(url)
+            return self.extract_jobs_with_gemini(html_content, company, source_category, url)
             
         except Exception as e:
             print(f"Error scraping {url}: {e}")
             return []
     
+    def fetch_page(self, url: str, timeout: float = REQUEST_TIMEOUT) -> str:
+        """Fetch a page's HTML, raising on network or HTTP errors"""
+        # Imported here so runs that never hit the network skip its import cost
+        import requests
+        
+        response = requests.get(url, headers=REQUEST_HEADERS, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+    
     def extract_jobs_with_gemini(self, html_content: str, company: str, 
-                                 source_category: str, base_url: str) -> List[Dict]:
+                                 source_category: str, base_url: str) -> ExtractedJobs:
         """
         Use Gemini to intelligently extract job listings from HTML
+        
+        Jobs parsed before an error or a truncated response are kept, but
+        the result is marked incomplete (as it is when Gemini isn't
+        configured), so callers don't mistake it for the whole page.
         """
+        jobs = ExtractedJobs()
         if not self.model:
             print("Gemini API not configured")
-            return []
+            jobs.complete = False
+            return jobs
         
+        stream = JsonObjectStream()
         try:
-            # Truncate HTML if too long (Gemini has token limits)
-            max_chars = 30000
-            if len(html_content) > max_chars:
-                html_content = html_content[:max_chars]
-            
-            prompt = f"""
+            for job in self.iter_jobs_with_gemini(html_content, company,
+                                                  source_category, base_url, stream):
+                jobs.append(job)
+        except Exception as e:
+            print(f"Error using Gemini to extract jobs: {e}")
+            jobs.complete = False
+        if stream.pending:
+            jobs.complete = False
+        
+        if jobs:
+            print(f"Extracted {len(jobs)} jobs from {company}")
+        return jobs
+    
+    def iter_jobs_with_gemini(self, html_content: str, company: str,
+                              source_category: str, base_url: str,
+                              stream: JsonObjectStream = None) -> Iterator[JobRecord]:
+        """
+        Stream the Gemini extraction, yielding each job as soon as its JSON
+        object is complete
+        
+        Pass `stream` to inspect it afterwards (e.g. `stream.pending` when
+        the response was truncated).
+        """
+        if not self.model:
+            print("Gemini API not configured")
+            return
+        
+        # Truncate HTML if too long (Gemini has token limits)
+        max_chars = 30000
+        if len(html_content) > max_chars:
+            html_content = html_content[:max_chars]
+        
+        prompt = f"""
 Extract all job postings from this career page HTML. For each job, extract:
 
 1. Job Title
@@ -101,45 +200,41 @@ HTML Content:
 
 Return ONLY the JSON array, no other text.
 """
-            
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Extract JSON from response (handle markdown code blocks)
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0].strip()
-            
-            # Parse JSON
-            jobs_data = json.loads(response_text)
-            
-            # Process and structure jobs
-            jobs = []
-            for idx, job_data in enumerate(jobs_data):
-                job = {
-                    'job_id': f"{company.lower().replace(' ', '_')}_{int(time.time())}_{idx}",
-                    'company': company,
-                    'title': job_data.get('title', 'Unknown Title'),
-                    'location': job_data.get('location', 'Not specified'),
-                    'url': job_data.get('url', base_url),
-                    'source_category': source_category,
-                    'description': job_data.get('description', ''),
-                    'posted_date': job_data.get('posted_date', ''),
-                    'scraped_date': datetime.now().isoformat()
-                }
-                jobs.append(job)
-            
-            print(f"Extracted {len(jobs)} jobs from {company}")
-            return jobs
-            
-        except json.JSONDecodeError as e:
-            print(f"Failed to parse Gemini response as JSON: {e}")
-            print(f"Response: {response_text[:500]}")
-            return []
-        except Exception as e:
-            print(f"Error using Gemini to extract jobs: {e}")
-            return []
+        
+        # One timestamp per page
+        scraped_date = datetime.now().isoformat()
+        
+        stream = stream or JsonObjectStream()
+        invalid = 0
+        idx = 0
+        for job_data in iter_json_objects(self._stream_text(prompt), stream):
+            job_data = validate_job_data(job_data, base_url)
+            if job_data is None:
+                invalid += 1
+                continue
+            # job_id is derived from the posting's fingerprint (stable across runs)
+            yield JobRecord(
+                job_id=None,
+                company=company,
+                source_category=source_category,
+                scraped_date=scraped_date,
+                **job_data
+            )
+            idx += 1
+        
+        if stream.pending:
+            print(f"Gemini response for {company} was truncated; kept {idx} complete jobs")
+        if stream.skipped or invalid:
+            print(f"Dropped {stream.skipped} malformed and {invalid} invalid job objects from {company}")
+    
+    def _stream_text(self, prompt: str) -> Iterator[str]:
+        """Yield response text chunks as Gemini generates them"""
+        for chunk in self.model.generate_content(prompt, stream=True):
+            try:
+                yield chunk.text
+            except ValueError:
+                # Chunk without text parts (e.g. final safety/finish metadata)
+                continue
     
     def analyze_job_match(self, job_description: str, user_profile: str) -> Dict:
         """
@@ -175,15 +270,16 @@ Return ONLY the JSON object.
 """
             
             response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
             
-            # Extract JSON
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0].strip()
+            # First complete JSON object, ignoring fences or surrounding text
+            analysis = parse_first_object(response.text)
+            if analysis is None:
+                raise ValueError(f"No JSON object in response: {response.text[:200]}")
             
-            analysis = json.loads(response_text)
+            try:
+                analysis['match_score'] = min(10, max(1, int(analysis.get('match_score', 5))))
+            except (TypeError, ValueError):
+                analysis['match_score'] = 5
             return analysis
             
         except Exception as e:
@@ -191,107 +287,178 @@ Return ONLY the JSON object.
             return {'match_score': 5, 'analysis': str(e)}
 
 
-def save_jobs_to_db(jobs: List[Dict]):
+def save_jobs_to_db(jobs: List[JobRecord], db_path: str = DATABASE_PATH):
     """
     Save scraped jobs to SQLite database
+    
+    Jobs the user rejected that retention has since archived (see
+    job_tombstones) are skipped rather than coming back as pending.
+    
+    Returns:
+        Number of new jobs inserted
     """
     if not jobs:
-        return
+        return 0
     
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
     
-    inserted = 0
+    jobs = [JobRecord.coerce(job) for job in jobs]
+    tombstoned = set()
+    job_ids = [job.job_id for job in jobs]
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        tombstoned.update(row[0] for row in conn.execute(
+            f"SELECT job_id FROM job_tombstones WHERE job_id IN ({', '.join('?' for _ in chunk)})",
+            chunk))
+    
+    classified_at = datetime.now().isoformat()
+    rows = []
+    profile_rows = []
     for job in jobs:
-        try:
-            cursor.execute('''
-                INSERT OR IGNORE INTO jobs 
-                (job_id, company, title, location, url, source_category, 
-                 description, posted_date, scraped_date, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
-            ''', (
-                job['job_id'],
-                job['company'],
-                job['title'],
-                job['location'],
-                job['url'],
-                job['source_category'],
-                job.get('description', ''),
-                job.get('posted_date', ''),
-                job['scraped_date']
-            ))
-            
-            if cursor.rowcount > 0:
-                inserted += 1
-                
-        except Exception as e:
-            print(f"Error inserting job {job.get('job_id')}: {e}")
+        if job.job_id in tombstoned:
             continue
+        keep, rule, reason = job.classification or (None, None, None)
+        for profile, (profile_keep, profile_rule, profile_reason) in (
+                job.profile_results or {}).items():
+            profile_rows.append((job.job_id, profile, 'keep' if profile_keep else 'reject',
+                                 profile_rule, profile_reason))
+        rows.append((
+            job.job_id,
+            job.company,
+            job.title,
+            job.location,
+            job.url,
+            job.source_category,
+            job.description,
+            job.posted_date,
+            job.scraped_date,
+            to_epoch(job.scraped_date),
+            to_epoch(job.posted_date),
+            job.fingerprint,
+            None if keep is None else ('keep' if keep else 'reject'),
+            rule,
+            reason,
+            classified_at if rule else None
+        ))
+    
+    inserted = 0
+    try:
+        cursor = conn.executemany('''
+            INSERT OR IGNORE INTO jobs 
+            (job_id, company, title, location, url, source_category, 
+             description, posted_date, scraped_date, scraped_ts, posted_ts,
+             fingerprint, filter_decision, filter_rule, filter_reason,
+             classified_at, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
+        ''', rows)
+        inserted = cursor.rowcount
+        conn.executemany('''
+            INSERT OR IGNORE INTO job_profiles (job_id, profile, decision, rule, reason)
+            VALUES (?, ?, ?, ?, ?)
+        ''', profile_rows)
+        conn.commit()
+    except Exception as e:
+        print(f"Error inserting jobs: {e}")
+        conn.rollback()
     
-    conn.commit()
     conn.close()
     
     print(f"Saved {inserted} new jobs to database")
+    return inserted
 
 
-def scrape_all_sources(sources_config: Dict):
+def scrape_all_sources(sources_config: Dict, pagination: Dict = None):
     """
     Scrape jobs from all configured sources with intelligent filtering
     
     Args:
         sources_config: Dictionary of sources from sources_config.py
+        pagination: Optional per-company pagination rules (sources_config.PAGINATION)
     """
     scraper = GeminiJobScraper()
-    job_filter = JobFilter()  # ✅ INITIALIZE FILTER
+    # ✅ INITIALIZE FILTER - every profile is checked in one pass per job
+    profile_matcher = ProfileMatcher(load_profiles())
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    migrate(conn)
+    known_fingerprints = load_known_fingerprints(conn)
+    health = HostHealth.load(conn)
+    page_store = get_page_store()  # raw HTML for replay.py, if RAW_PAGE_DIR is set
+    # Companies not fully crawled for FULL_CRAWL_DAYS skip the early stop this run
+    full_crawl = companies_due_full_crawl(conn)
     
     total_scraped = 0
     total_filtered = 0
+    total_pages = 0
+    skipped_listings = 0
     filtered_jobs = []
+    seen_jobs = []
+    stored_pages = []
+    company_runs = {}
     
-    for source_name, source_data in sources_config.items():
-        print(f"\n{'='*60}")
-        print(f"Scraping Source: {source_name}")
-        print(f"{'='*60}")
+    # Listings are crawled concurrently; results arrive as each one finishes
+    for result in crawl_sources(sources_config, scraper, pagination, known_fingerprints,
+                                health=health, page_store=page_store,
+                                full_crawl=full_crawl):
+        jobs = result['jobs']
+        print(f"\n→ {result['company']} ({result['source_category']})")
+        print(f"  URL: {result['url']}")
         
-        companies = source_data.get('companies', {})
+        total_scraped += len(jobs)
+        total_pages += result['pages']
+        seen_jobs.extend(jobs)
+        stored_pages.extend(result['stored_pages'])
+        if result['stop_reason'] in ('circuit_open', 'backoff'):
+            skipped_listings += 1
         
-        for company_name, career_urls in companies.items():
-            print(f"\n→ Scraping {company_name}...")
-            
-            for url in career_urls:
-                print(f"  URL: {url}")
-                
-                try:
-                    jobs = scraper.scrape_jobs_from_url(url, company_name, source_name)
-                    total_scraped += len(jobs)
-                    
-                    # ✅ APPLY FILTERS
-                    for job in jobs:
-                        if job_filter.should_keep(job):
-                            filtered_jobs.append(job)
-                            total_filtered += 1
-                        else:
-                            print(f"    ✗ Filtered out: {job.get('title')} - {job.get('location')}")
-                    
-                    print(f"    Found: {len(jobs)} jobs | Kept: {len([j for j in jobs if job_filter.should_keep(j)])} after filtering")
-                    
-                    # Rate limiting - be respectful
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    print(f"  Error: {e}")
-                    continue
+        # ✅ APPLY FILTERS (once per job)
+        kept = 0
+        for job in jobs:
+            # Kept if any profile keeps it
+            if profile_matcher.apply(job):
+                filtered_jobs.append(job)
+                kept += 1
+            else:
+                print(f"    ✗ Filtered out: {job.title} - {job.location}")
+        total_filtered += kept
+        
+        company = result['company']
+        company_runs.setdefault(company, CompanyRun(company)).add_listing(
+            jobs, result['stop_reason'])
+        
+        print(f"    Pages: {result['pages']} (stopped: {result['stop_reason']}) | "
+              f"Found: {len(jobs)} jobs | Kept: {kept} after filtering")
+    
+    # Failures, latencies and retry schedules carry over to the next run
+    health.save(conn)
+    record_pages(conn, stored_pages)
     
     # Save filtered jobs to database
     print(f"\n{'='*60}")
     print(f"Scraping Complete")
     print(f"{'='*60}")
+    print(f"Pages fetched: {total_pages}")
+    print(f"Companies due a full crawl: {len(full_crawl)}")
+    print(f"Listings skipped (failing host or retry backoff): {skipped_listings}")
     print(f"Total jobs scraped: {total_scraped}")
     print(f"Jobs after filtering: {total_filtered}")
     print(f"Filter rate: {((total_scraped - total_filtered) / total_scraped * 100) if total_scraped > 0 else 0:.1f}% filtered out")
     print(f"{'='*60}")
     
+    # Diff against stored postings before saving, then record after
+    run_ts = int(time.time())
+    diffs = [diff_company(conn, run) for run in company_runs.values()]
+    
     save_jobs_to_db(filtered_jobs)
+    record_fingerprints(conn, seen_jobs)
+    
+    for diff in diffs:
+        record_diff(conn, diff, run_ts)
+        print(f"  {diff['company']}: +{len(diff['added'])} new, "
+              f"-{len(diff['removed'])} closed, {len(diff['reopened'])} reopened"
+              f"{'' if diff['complete'] else ' (partial crawl, closures skipped)'}")
+    conn.close()
     return filtered_jobs
 
 
@@ -299,7 +466,8 @@ def scrape_all_sources(sources_config: Dict):
 if __name__ == '__main__':
     # Import sources configuration
     try:
-        from sources_config import SOURCES
-        scrape_all_sources(SOURCES)
+        import sources_config
+        scrape_all_sources(sources_config.SOURCES,
+                           getattr(sources_config, 'PAGINATION', {}))
     except ImportError:
         print("sources_config.py not found. Please create it with your company URLs.")
@@ -0,0 +1,10 @@
+"""
+Gunicorn Configuration
+Loaded automatically by gunicorn from the working directory. Schema
+migrations run once in the master process before any worker is forked
+"""
+
+
+def on_starting(server):
+    from schema import migrate
+    migrate()
@@ -0,0 +1,197 @@
+"""
+Per-Host Health Tracking
+Circuit breaking per source host, request timeouts adapted to each host's
+observed latency, and a persistent per-URL error history so consistently
+failing listings are tried last and only retried on a backoff schedule.
+State is loaded from and saved to jobs.db around each scrape run
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 3))  # consecutive failures
+CIRCUIT_COOLDOWN = int(os.getenv('CIRCUIT_COOLDOWN', 3600))         # seconds, doubles per re-open
+MAX_COOLDOWN = 7 * 24 * 3600
+URL_BACKOFF = int(os.getenv('URL_BACKOFF', 4 * 3600))               # seconds, doubles per failure
+MAX_URL_BACKOFF = 7 * 24 * 3600
+
+MIN_TIMEOUT = float(os.getenv('MIN_REQUEST_TIMEOUT', 5))
+MAX_TIMEOUT = float(os.getenv('MAX_REQUEST_TIMEOUT', 30))
+TIMEOUT_MULTIPLIER = 3       # timeout = p95 latency x this, within MIN..MAX
+LATENCY_SAMPLES = 50         # recent successful latencies kept per host
+MIN_LATENCY_SAMPLES = 5      # below this, use MAX_TIMEOUT
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def is_host_failure(error: Exception) -> bool:
+    """
+    Whether an error says something about the host rather than one URL
+
+    Connection errors, timeouts, 5xx and 429 count against the host; other
+    4xx responses (a moved or removed listing) only count against the URL.
+    """
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return not (status and 400 <= status < 500 and status != 429)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class HostHealth:
+    """
+    Thread-safe health state for every host and listing URL of a run
+
+    Circuit per host: FAILURE_THRESHOLD consecutive failures open it for
+    CIRCUIT_COOLDOWN (doubling on each re-open); once the cooldown passes a
+    single probe request is let through (half-open) and its outcome closes
+    or re-opens the circuit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts: Dict[str, Dict] = {}
+        self.urls: Dict[str, Dict] = {}
+        self._probing = set()
+
+    def _host(self, host: str) -> Dict:
+        return self.hosts.setdefault(host, {
+            'state': CLOSED, 'failures': 0, 'opens': 0, 'opened_until': 0,
+            'latencies': [], 'last_error': None,
+        })
+
+    def allow(self, url: str) -> bool:
+        """True if a request to url's host may be sent now"""
+        host = host_of(url)
+        with self._lock:
+            state = self._host(host)
+            if state['state'] == CLOSED:
+                return True
+            if time.time() < state['opened_until'] or host in self._probing:
+                return False
+            state['state'] = HALF_OPEN
+            self._probing.add(host)
+            return True
+
+    def is_open(self, url: str) -> bool:
+        """True while url's host is cooling down (does not claim the probe)"""
+        with self._lock:
+            state = self.hosts.get(host_of(url))
+            return bool(state) and state['state'] == OPEN and time.time() < state['opened_until']
+
+    def timeout(self, url: str) -> float:
+        """Request timeout for url's host from its p95 latency"""
+        with self._lock:
+            latencies = self._host(host_of(url))['latencies']
+            if len(latencies) < MIN_LATENCY_SAMPLES:
+                return MAX_TIMEOUT
+            p95 = percentile(latencies, 0.95)
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, p95 * TIMEOUT_MULTIPLIER))
+
+    def record_success(self, url: str, elapsed: float):
+        host = host_of(url)
+        with self._lock:
+            state = self._host(host)
+            state.update(state=CLOSED, failures=0, opens=0, opened_until=0)
+            state['latencies'] = (state['latencies'] + [round(elapsed, 3)])[-LATENCY_SAMPLES:]
+            self._probing.discard(host)
+
+    def record_failure(self, url: str, error: Exception):
+        host = host_of(url)
+        with self._lock:
+            self._probing.discard(host)
+            state = self._host(host)
+            if not is_host_failure(error):
+                # The host answered, so it is up even if this URL is not
+                state.update(state=CLOSED, failures=0, opens=0, opened_until=0)
+                return
+            state['failures'] += 1
+            state['last_error'] = str(error)[:500]
+            if state['state'] == HALF_OPEN or state['failures'] >= FAILURE_THRESHOLD:
+                state['opens'] += 1
+                cooldown = min(MAX_COOLDOWN, CIRCUIT_COOLDOWN * 2 ** (state['opens'] - 1))
+                state.update(state=OPEN, opened_until=int(time.time() + cooldown))
+                print(f"  ⚡ Circuit open for {host} ({state['failures']} failures, "
+                      f"retry in {cooldown // 60} min): {state['last_error']}")
+
+    def url_due(self, url: str) -> bool:
+        """False while a failing listing URL waits out its backoff"""
+        with self._lock:
+            entry = self.urls.get(url)
+        return entry is None or time.time() >= entry['next_retry_ts']
+
+    def record_url(self, url: str, error: Optional[Exception] = None):
+        """Record a listing crawl's outcome; failures push its next retry out"""
+        now = int(time.time())
+        with self._lock:
+            entry = self.urls.setdefault(url, {
+                'failures': 0, 'total_failures': 0, 'last_error': None,
+                'last_failure_ts': None, 'last_success_ts': None, 'next_retry_ts': 0,
+            })
+            if error is None:
+                entry.update(failures=0, last_success_ts=now, next_retry_ts=0)
+                return
+            entry['failures'] += 1
+            entry['total_failures'] += 1
+            entry['last_error'] = str(error)[:500]
+            entry['last_failure_ts'] = now
+            # The first failure may be transient: retry on the next run
+            backoff = 0 if entry['failures'] == 1 else \
+                min(MAX_URL_BACKOFF, URL_BACKOFF * 2 ** (entry['failures'] - 2))
+            entry['next_retry_ts'] = now + backoff
+
+    def rank(self, url: str):
+        """Sort key putting healthy listings first, failing ones and open circuits last"""
+        with self._lock:
+            failures = self.urls.get(url, {}).get('failures', 0)
+            host_state = self.hosts.get(host_of(url), {}).get('state', CLOSED)
+        return (host_state != CLOSED, failures)
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> 'HostHealth':
+        health = cls()
+        for host, state, failures, opens, opened_until, latencies, last_error in conn.execute(
+                'SELECT host, state, failures, opens, opened_until, latencies, last_error '
+                'FROM host_health'):
+            health.hosts[host] = {
+                'state': state, 'failures': failures, 'opens': opens,
+                'opened_until': opened_until, 'latencies': json.loads(latencies or '[]'),
+                'last_error': last_error,
+            }
+        for row in conn.execute(
+                'SELECT url, failures, total_failures, last_error, last_failure_ts, '
+                'last_success_ts, next_retry_ts FROM url_errors'):
+            health.urls[row[0]] = dict(zip(
+                ('failures', 'total_failures', 'last_error', 'last_failure_ts',
+                 'last_success_ts', 'next_retry_ts'), row[1:]))
+        return health
+
+    def save(self, conn: sqlite3.Connection):
+        now = int(time.time())
+        with self._lock, conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO host_health
+                (host, state, failures, opens, opened_until, latencies, last_error, updated_ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(host, s['state'], s['failures'], s['opens'], s['opened_until'],
+                   json.dumps(s['latencies']), s['last_error'], now)
+                  for host, s in self.hosts.items()])
+            conn.executemany('''
+                INSERT OR REPLACE INTO url_errors
+                (url, host, failures, total_failures, last_error, last_failure_ts,
+                 last_success_ts, next_retry_ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(url, host_of(url), e['failures'], e['total_failures'], e['last_error'],
+                   e['last_failure_ts'], e['last_success_ts'], e['next_retry_ts'])
+                  for url, e in self.urls.items()])
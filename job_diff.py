@@ -0,0 +1,121 @@
+"""
+Per-Company Result Diffing
+Compares each company's freshly scraped fingerprints with the postings
+already stored, recording which appeared, reopened or closed since the
+previous run (consumed through /api/changes)
+"""
+
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Set
+
+from job_record import JobRecord
+
+# A company whose last complete crawl is older than this gets crawled past
+# known postings, so early-stopped companies still get closures periodically
+FULL_CRAWL_DAYS = int(os.getenv('FULL_CRAWL_DAYS', 7))
+
+
+class CompanyRun:
+    """Fingerprints collected for one company across all of its listing URLs"""
+
+    __slots__ = ('company', 'seen', 'kept', 'complete')
+
+    def __init__(self, company: str):
+        self.company = company
+        self.seen: Set[str] = set()   # every extracted posting
+        self.kept: Set[str] = set()   # postings that passed the filter
+        self.complete = True          # every listing was crawled to its end
+
+    def add_listing(self, jobs: Iterable[JobRecord], stop_reason: str):
+        for job in jobs:
+            self.seen.add(job.fingerprint)
+            if job.classification and job.classification[0]:
+                self.kept.add(job.fingerprint)
+        # Pages past an early stop, a cap or an error were never looked at,
+        # and a failed extraction or suspicious empty page proves nothing
+        if stop_reason != 'end':
+            self.complete = False
+
+
+def diff_company(conn: sqlite3.Connection, run: CompanyRun) -> Dict:
+    """
+    Set-compare a company's run against its stored postings
+
+    Must run before the run's new jobs are saved. Postings only count as
+    removed when the run was complete, since an unvisited page proves
+    nothing about the jobs on it. Rejected postings archived by retention
+    (job_tombstones) are never added again.
+
+    Returns:
+        Dictionary of fingerprint sets: added, reopened, removed, unchanged
+    """
+    stored = dict(conn.execute(
+        'SELECT fingerprint, closed_ts FROM jobs WHERE company = ? AND fingerprint IS NOT NULL',
+        (run.company,)
+    ).fetchall())
+    tombstoned = {fp for (fp,) in conn.execute(
+        'SELECT fingerprint FROM job_tombstones WHERE company = ? AND fingerprint IS NOT NULL',
+        (run.company,)
+    )}
+    open_fingerprints = {fp for fp, closed_ts in stored.items() if closed_ts is None}
+    closed_fingerprints = stored.keys() - open_fingerprints
+
+    return {
+        'company': run.company,
+        'complete': run.complete,
+        'added': run.kept - stored.keys() - tombstoned,
+        'reopened': run.seen & closed_fingerprints,
+        'removed': (open_fingerprints - run.seen) if run.complete else set(),
+        'unchanged': open_fingerprints & run.seen,
+    }
+
+
+def companies_due_full_crawl(conn: sqlite3.Connection,
+                            days: int = FULL_CRAWL_DAYS) -> Set[str]:
+    """
+    Companies whose last complete run is more than `days` old (or never was)
+
+    Returns:
+        Set of company names to crawl without stopping at known postings
+    """
+    cutoff = int(time.time()) - days * 86400
+    return {company for (company,) in conn.execute('''
+        SELECT company FROM company_diffs GROUP BY company
+        HAVING COALESCE(MAX(CASE WHEN complete = 1 THEN run_ts END), 0) < ?
+    ''', (cutoff,))}
+
+
+def record_diff(conn: sqlite3.Connection, diff: Dict, run_ts: int):
+    """
+    Apply a diff to the jobs table (last seen / closed markers) and log it
+
+    Must run after the run's new jobs are saved, so added postings have rows.
+    """
+    seen = diff['added'] | diff['reopened'] | diff['unchanged']
+
+    with conn:
+        conn.executemany('UPDATE jobs SET last_seen_ts = ? WHERE fingerprint = ?',
+                         [(run_ts, fp) for fp in seen])
+        conn.executemany('UPDATE jobs SET closed_ts = NULL WHERE fingerprint = ?',
+                         [(fp,) for fp in diff['reopened']])
+        conn.executemany('UPDATE jobs SET closed_ts = ? WHERE fingerprint = ?',
+                         [(run_ts, fp) for fp in diff['removed']])
+
+        conn.execute('''
+            INSERT INTO company_diffs
+            (company, run_ts, added, removed, reopened, unchanged, complete)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (diff['company'], run_ts, len(diff['added']), len(diff['removed']),
+              len(diff['reopened']), len(diff['unchanged']), int(diff['complete'])))
+
+        for event in ('added', 'reopened', 'removed'):
+            fingerprints = list(diff[event])
+            for start in range(0, len(fingerprints), 500):
+                chunk = fingerprints[start:start + 500]
+                conn.execute(f'''
+                    INSERT INTO job_events (ts, company, job_id, event)
+                    SELECT ?, company, job_id, ? FROM jobs
+                    WHERE fingerprint IN ({', '.join('?' for _ in chunk)})
+                ''', (run_ts, 'closed' if event == 'removed' else event, *chunk))
@@ -0,0 +1,140 @@
+"""
+Compact Job Record
+Slotted job representation used through the scraper pipeline
+(extract → filter → save). Repeated strings are interned and the
+normalized text used by JobFilter is computed once per job
+"""
+
+import sys
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional
+
+FIELDS = (
+    'job_id', 'company', 'title', 'location', 'url', 'source_category',
+    'description', 'posted_date', 'scraped_date',
+)
+
+# Fields whose values repeat across many jobs (same company/page/run)
+INTERNED_FIELDS = ('company', 'location', 'source_category', 'posted_date', 'scraped_date')
+
+
+def to_epoch(value: Optional[str]) -> Optional[int]:
+    """
+    Convert an ISO date/datetime string (local time, as the scraper writes
+    it) to integer epoch seconds, or None if it isn't one
+    """
+    if not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def _intern(value) -> str:
+    return sys.intern(value) if isinstance(value, str) else ('' if value is None else str(value))
+
+
+class JobRecord:
+    """
+    A single scraped job
+
+    Behaves like the dicts it replaces for read access (`job['title']`,
+    `job.get('title')`) so existing callers keep working.
+    """
+
+    __slots__ = FIELDS + ('classification', 'profile_results', '_fingerprint',
+                          '_norm_title', '_norm_location', '_norm_description')
+
+    def __init__(self, job_id: Optional[str], company: str, title: str, location: str,
+                 url: str, source_category: str, description: str = '',
+                 posted_date: str = '', scraped_date: str = ''):
+        self.company = _intern(company)
+        self.title = title or ''
+        self.location = _intern(location)
+        self.url = url
+        self.source_category = _intern(source_category)
+        self.description = description or ''
+        self.posted_date = _intern(posted_date)
+        self.scraped_date = _intern(scraped_date)
+        # (keep, rule, reason) from JobFilter.classify, once filtered
+        self.classification = None
+        # {profile: (keep, rule, reason)} from ProfileMatcher.classify
+        self.profile_results = None
+        self._fingerprint = None
+        # Without an explicit id, the same posting gets the same id every run
+        self.job_id = job_id or f"{self.company.lower().replace(' ', '_')}_{self.fingerprint}"
+        self._norm_title = None
+        self._norm_location = None
+        self._norm_description = None
+
+    @classmethod
+    def from_dict(cls, job: Dict) -> 'JobRecord':
+        return cls(**{field: job.get(field, '') for field in FIELDS})
+
+    @classmethod
+    def coerce(cls, job) -> 'JobRecord':
+        """Return `job` unchanged if it is already a JobRecord, else convert it"""
+        return job if isinstance(job, cls) else cls.from_dict(job)
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    # ---- dict-style read access --------------------------------------
+
+    def __getitem__(self, key: str):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Optional[str] = None):
+        return getattr(self, key) if key in FIELDS else default
+
+    def __repr__(self):
+        return f"JobRecord({self.company!r}, {self.title!r}, {self.location!r})"
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable hash of company/title/location/url identifying a posting across runs"""
+        if self._fingerprint is None:
+            key = '\x1f'.join(' '.join(value.lower().split()) for value in
+                               (self.company, self.title, self.location, self.url or ''))
+            self._fingerprint = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return self._fingerprint
+
+    # ---- normalized text for filtering (lowercased, space padded) ----
+
+    @property
+    def norm_title(self) -> str:
+        if self._norm_title is None:
+            self._norm_title = f" {self.title.lower()} "
+        return self._norm_title
+
+    @property
+    def norm_location(self) -> str:
+        if self._norm_location is None:
+            # Locations repeat heavily, so share the normalized string too
+            self._norm_location = sys.intern(f" {self.location.lower()} ")
+        return self._norm_location
+
+    @property
+    def norm_description(self) -> str:
+        if self._norm_description is None:
+            self._norm_description = f" {self.description.lower()} "
+        return self._norm_description
+
+
+class ExtractedJobs(list):
+    """
+    Jobs extracted from one page
+
+    `complete` is False when extraction failed or the model's response was
+    cut off, so the page may hold postings that are missing from the list.
+    """
+
+    __slots__ = ('complete',)
+
+    def __init__(self, jobs=(), complete: bool = True):
+        super().__init__(jobs)
+        self.complete = complete
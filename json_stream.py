@@ -0,0 +1,92 @@
+"""
+Tolerant Streaming JSON Parser
+Pulls complete JSON objects out of LLM output as it streams in. Markdown
+fences, stray prose and truncated arrays are tolerated: every object that
+closes is returned, and only a cut-off trailing object is lost
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class JsonObjectStream:
+    """
+    Incremental scanner for top-level JSON objects
+
+    Feed text chunks with feed(); each call returns the objects completed by
+    that chunk. Objects nested inside another object stay part of their
+    parent, so for a response like ```json [ {...}, {...} ``` each array
+    element is returned as soon as its closing brace arrives.
+    """
+
+    def __init__(self):
+        self._buffer = []       # characters of the object being scanned
+        self._open = []         # unclosed '{' / '[' of the current object
+        self._in_string = False
+        self._escape = False
+        self.parsed = 0         # objects returned
+        self.skipped = 0        # balanced but invalid objects (e.g. trailing commas)
+
+    @property
+    def pending(self) -> bool:
+        """True if the stream ended inside an object (truncated output)"""
+        return bool(self._open)
+
+    def feed(self, chunk: str) -> List[Dict]:
+        objects = []
+        for char in chunk:
+            if not self._open:
+                # Outside any object: skip fences, prose, '[' ',' ']'
+                if char == '{':
+                    self._buffer = ['{']
+                    self._open = ['{']
+                continue
+
+            self._buffer.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._open.append(char)
+            elif char in '}]':
+                # A mismatched closer (e.g. '[1, 2}') also closes the unclosed
+                # inner brackets, so one bad object can't swallow the rest
+                opener = '{' if char == '}' else '['
+                while self._open and self._open.pop() != opener:
+                    pass
+                if not self._open:
+                    obj = self._decode(''.join(self._buffer))
+                    self._buffer = []
+                    if obj is not None:
+                        objects.append(obj)
+        return objects
+
+    def _decode(self, text: str) -> Optional[Dict]:
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            self.skipped += 1
+            return None
+        self.parsed += 1
+        return obj
+
+
+def iter_json_objects(chunks: Iterable[str], stream: JsonObjectStream = None) -> Iterator[Dict]:
+    """Yield each complete top-level object from an iterable of text chunks"""
+    stream = stream or JsonObjectStream()
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+
+
+def parse_first_object(text: str) -> Optional[Dict]:
+    """Return the first complete JSON object in `text`, ignoring surrounding text"""
+    return next(iter_json_objects([text]), None)
@@ -0,0 +1,127 @@
+"""
+Raw Page Store
+Optional on-disk store of fetched listing HTML, so extraction can be re-run
+offline (see replay.py). Pages are compressed (zstd when the zstandard
+package is installed, gzip otherwise) and content-addressed by SHA-256, so
+a page that hasn't changed between runs is stored once
+"""
+
+import os
+import gzip
+import time
+import hashlib
+import sqlite3
+import tempfile
+from typing import List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+RAW_PAGE_DIR = os.getenv('RAW_PAGE_DIR', '')  # empty: pages are not stored
+ZSTD_LEVEL = 10
+
+# (url, sha256, listing_url, company, source_category, page_index) per fetched page
+StoredPage = Tuple[str, str, str, str, str, int]
+
+
+class PageStore:
+    """
+    Content-addressed blobs under root/ab/abcdef....html.zst (or .html.gz)
+
+    Writes go through a temporary file and an atomic rename, so concurrent
+    crawler threads storing the same page are safe.
+    """
+
+    EXTENSIONS = ('.html.zst', '.html.gz')
+
+    def __init__(self, root: str = RAW_PAGE_DIR):
+        self.root = root
+        self.extension = '.html.zst' if zstandard else '.html.gz'
+
+    def _path(self, digest: str, extension: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + extension)
+
+    def put(self, html: str) -> str:
+        """Store a page and return its SHA-256 (a no-op if already stored)"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        # Either compression counts, so switching codecs doesn't duplicate pages
+        if any(os.path.exists(self._path(digest, ext)) for ext in self.EXTENSIONS):
+            return digest
+
+        if zstandard:
+            blob = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        else:
+            blob = gzip.compress(data, compresslevel=9)
+
+        path = self._path(digest, self.extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+        return digest
+
+    def delete(self, digest: str):
+        """Remove a stored page (in whichever compression it was written)"""
+        for extension in self.EXTENSIONS:
+            try:
+                os.remove(self._path(digest, extension))
+            except FileNotFoundError:
+                pass
+
+    def get(self, digest: str) -> str:
+        """Load a stored page's HTML"""
+        zst_path = self._path(digest, '.html.zst')
+        if os.path.exists(zst_path):
+            if not zstandard:
+                raise RuntimeError(f"{zst_path} needs the zstandard package (pip install zstandard)")
+            with open(zst_path, 'rb') as f:
+                return zstandard.ZstdDecompressor().decompress(f.read()).decode('utf-8')
+        with open(self._path(digest, '.html.gz'), 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+
+
+def get_page_store() -> Optional[PageStore]:
+    """The configured store, or None when RAW_PAGE_DIR is unset"""
+    return PageStore(RAW_PAGE_DIR) if RAW_PAGE_DIR else None
+
+
+def record_pages(conn: sqlite3.Connection, pages: List[StoredPage]):
+    """Index stored pages; a page seen again with the same content only updates last_seen_ts"""
+    now = int(time.time())
+    with conn:
+        conn.executemany('''
+            INSERT INTO raw_pages
+            (url, sha256, listing_url, company, source_category, page_index,
+             first_seen_ts, last_seen_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url, sha256) DO UPDATE SET last_seen_ts = excluded.last_seen_ts
+        ''', [(*page, now, now) for page in pages])
+
+
+def prune_pages(conn: sqlite3.Connection, cutoff_ts: int,
+                store: Optional[PageStore] = None) -> Tuple[int, int]:
+    """
+    Forget page versions last seen before cutoff_ts
+
+    Blobs no longer referenced by any remaining version are deleted from
+    `store` when one is given.
+
+    Returns:
+        (index rows removed, blobs deleted)
+    """
+    # A blob can back several URLs, so it goes only when all its versions do
+    unused = [row[0] for row in conn.execute(
+        'SELECT sha256 FROM raw_pages GROUP BY sha256 HAVING MAX(last_seen_ts) < ?',
+        (cutoff_ts,))]
+    with conn:
+        removed = conn.execute('DELETE FROM raw_pages WHERE last_seen_ts < ?',
+                               (cutoff_ts,)).rowcount
+    if not store:
+        return removed, 0
+    for digest in unused:
+        store.delete(digest)
+    return removed, len(unused)
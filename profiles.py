@@ -0,0 +1,296 @@
+"""
+Multi-Profile Filtering
+Filter rules defined as data (sources_config.PROFILES) and compiled into
+one shared matcher: each text field of a job is scanned once for the union
+of every profile's keywords, then each profile's decision is a cheap set
+lookup. Cost grows with jobs, not jobs x profiles
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from jobfilter import Classification, JobFilter, keyword_pattern
+from job_record import JobRecord
+
+# Built-in keyword sets profiles can reference as "@name"
+KEYWORD_SETS = {
+    'usa': JobFilter.USA_KEYWORDS,
+    'tech': JobFilter.TECH_TITLE_KEYWORDS,
+    'entry_level': JobFilter.ACCEPTABLE_EXP_KEYWORDS,
+}
+
+# Same rules as JobFilter, used when sources_config defines no PROFILES
+DEFAULT_PROFILES = {
+    'default': {
+        'locations': ['@usa'],
+        'titles': ['@tech'],
+        'experience': ['@entry_level'],
+    },
+}
+
+RULES = ('locations', 'titles', 'experience')
+
+# Reasons name the rule that decided, not its keywords, since every profile
+# brings its own keyword lists
+REJECT_LOCATION = (False, 'location', 'no matching location keyword')
+REJECT_TITLE = (False, 'title', 'no matching title keyword')
+REJECT_EXPERIENCE = (False, 'experience', 'experience mentioned without a matching keyword')
+NO_EXPERIENCE_RULE = (True, 'experience', 'no experience rule')
+NO_EXPERIENCE_REQUIREMENT = (True, 'experience', 'no experience requirement')
+
+
+def _expand(keywords: Optional[Sequence[str]]) -> Optional[frozenset]:
+    """Resolve "@set" references and lowercase literals; None means no rule"""
+    if keywords is None:
+        return None
+    expanded = set()
+    for keyword in keywords:
+        if keyword.startswith('@'):
+            if keyword[1:] not in KEYWORD_SETS:
+                raise ValueError(f"Unknown keyword set {keyword}; "
+                                 f"use one of {', '.join('@' + k for k in KEYWORD_SETS)}")
+            expanded.update(KEYWORD_SETS[keyword[1:]])
+        else:
+            expanded.add(keyword.lower())
+    return frozenset(expanded)
+
+
+class _FieldScanner:
+    """
+    Finds every keyword (from the union of all profiles) occurring in a text
+
+    A zero-width lookahead over a prefix-tree regex reports the longest
+    keyword starting at each position; every shorter keyword starting there
+    is one of its prefixes, so a precomputed prefix closure recovers them.
+    """
+
+    def __init__(self, keywords: frozenset):
+        self.enabled = bool(keywords)
+        if not self.enabled:
+            return
+        pattern = keyword_pattern(keywords)
+        # Plain search finds the first hit fast (most texts have none);
+        # the lookahead scan then starts from there
+        self._search = pattern.search
+        self._pattern = re.compile(f'(?=({pattern.pattern}))')
+        # keyword -> keywords that are prefixes of it (itself included), longest first
+        self._closure = {
+            keyword: tuple(sorted((k for k in keywords if keyword.startswith(k)),
+                                  key=len, reverse=True))
+            for keyword in keywords
+        }
+
+    def scan(self, text: str) -> List[Tuple[str, ...]]:
+        """Matched keyword groups in text order (each group longest first)"""
+        if not self.enabled:
+            return []
+        first = self._search(text)
+        if first is None:
+            return []
+        closure = self._closure
+        return [closure[match] for match in self._pattern.findall(text, first.start())]
+
+    def scan_first(self, text: str) -> List[Tuple[str, ...]]:
+        """
+        Only the leftmost group of scan()
+
+        The prefix-tree regex is greedy, so a plain search already returns
+        the longest keyword at the first hit.
+        """
+        if not self.enabled:
+            return []
+        first = self._search(text)
+        return [] if first is None else [self._closure[first.group()]]
+
+    def hits(self, text: str) -> frozenset:
+        """Every keyword occurring in text"""
+        return frozenset(keyword for group in self.scan(text) for keyword in group)
+
+    def scan_column(self, texts: Sequence[str]) -> List[frozenset]:
+        """hits() for a column of texts, scanning each distinct value once"""
+        distinct = {text: self.hits(text) for text in set(texts)}
+        return [distinct[text] for text in texts]
+
+
+def _first_hit(groups: List[Tuple[str, ...]], keywords: frozenset) -> Optional[str]:
+    """Leftmost, then longest, matched keyword belonging to `keywords`"""
+    for group in groups:
+        for keyword in group:
+            if keyword in keywords:
+                return keyword
+    return None
+
+
+class ProfileMatcher:
+    """
+    Evaluates jobs against every profile in a single pass
+
+    Profiles are dicts with optional keyword lists under "locations",
+    "titles" and "experience"; a missing list means that requirement is not
+    applied. Decisions follow JobFilter exactly, so the "default" profile
+    keeps and rejects the same jobs as JobFilter.classify (with reasons
+    worded for any keyword list).
+    """
+
+    def __init__(self, profiles: Dict[str, Dict] = None):
+        profiles = profiles or DEFAULT_PROFILES
+        self.profile_names = list(profiles)
+        self._rules = [
+            tuple(_expand(profiles[name].get(rule)) for rule in RULES)
+            for name in self.profile_names
+        ]
+
+        def union(index):
+            return frozenset().union(*(rules[index] or () for rules in self._rules))
+
+        self._locations = _FieldScanner(union(0))
+        self._titles = _FieldScanner(union(1))
+        self._experience = _FieldScanner(union(2))
+        # When every experience rule is the whole keyword union, each profile's
+        # first hit is the text's first hit, so long descriptions need no full scan
+        self._scan_experience = (
+            self._experience.scan_first
+            if all(rules[2] is None or rules[2] == union(2) for rules in self._rules)
+            else self._experience.scan)
+
+    def classify(self, job) -> Dict[str, Classification]:
+        """Per-profile (keep, rule, reason) for one JobRecord or job dict"""
+        job = JobRecord.coerce(job)
+        results = self._classify_normalized(job.norm_title, job.norm_location,
+                                            job.norm_description)
+        return dict(zip(self.profile_names, results))
+
+    def apply(self, job: JobRecord) -> bool:
+        """
+        Classify a record in place: profile_results per profile and the
+        combined classification (kept if any profile keeps it)
+        """
+        job.profile_results = self.classify(job)
+        job.classification = combine(list(job.profile_results.values()))
+        return job.classification[0]
+
+    def classify_columns(self, titles: Sequence[str], locations: Sequence[str],
+                         descriptions: Sequence[str]) -> List[Tuple[Classification, ...]]:
+        """
+        Classify many jobs at once from column lists (e.g. a chunk of the jobs table)
+
+        Each field is scanned over the whole column first (titles and
+        locations once per distinct value, since they repeat heavily), then
+        each profile is decided column by column from those hits, giving the
+        same answers as classify() without a Python call per job.
+
+        Returns:
+            One tuple per job, aligned with self.profile_names
+        """
+        titles = [f" {(title or '').lower()} " for title in titles]
+        locations = [f" {(location or '').lower()} " for location in locations]
+        location_hits = self._locations.scan_column(locations)
+        title_hits = self._titles.scan_column(titles)
+
+        # Location and title requirements per profile, as columns
+        everything = [True] * len(titles)
+        passed = []
+        for profile_locations, profile_titles, _ in self._rules:
+            location_ok = (everything if profile_locations is None else
+                           [not hits.isdisjoint(profile_locations) for hits in location_hits])
+            title_ok = (everything if profile_titles is None else
+                        [not hits.isdisjoint(profile_titles) for hits in title_hits])
+            passed.append((location_ok, title_ok))
+
+        # The experience text is only built and scanned for jobs that some
+        # profile with an experience rule hasn't rejected yet
+        need_experience = [False] * len(titles)
+        for (location_ok, title_ok), (_, _, experience) in zip(passed, self._rules):
+            if experience is not None:
+                need_experience = [need or (location and title) for need, location, title
+                                   in zip(need_experience, location_ok, title_ok)]
+        combined = [f"{title}  {(description or '').lower()} " if need else None
+                    for title, description, need in zip(titles, descriptions, need_experience)]
+        scan_experience = self._scan_experience
+        experience_groups = [None if text is None else scan_experience(text)
+                             for text in combined]
+
+        columns = [
+            self._decide_column(rules[2], location_ok, title_ok, experience_groups, combined)
+            for rules, (location_ok, title_ok) in zip(self._rules, passed)
+        ]
+        return list(zip(*columns))
+
+    @staticmethod
+    def _decide_column(experience: Optional[frozenset], location_ok: List[bool],
+                       title_ok: List[bool], experience_groups: List, combined: List
+                       ) -> List[Classification]:
+        """One profile's decisions for a column of pre-scanned jobs"""
+        results = []
+        for location_passed, title_passed, groups, text in zip(
+                location_ok, title_ok, experience_groups, combined):
+            if not location_passed:
+                results.append(REJECT_LOCATION)
+            elif not title_passed:
+                results.append(REJECT_TITLE)
+            elif experience is None:
+                results.append(NO_EXPERIENCE_RULE)
+            else:
+                hit = _first_hit(groups, experience)
+                if hit:
+                    results.append((True, 'experience', f"matched '{hit.strip()}'"))
+                elif not ('experience' in text or 'year' in text):
+                    results.append(NO_EXPERIENCE_REQUIREMENT)
+                else:
+                    results.append(REJECT_EXPERIENCE)
+        return results
+
+    def _classify_normalized(self, title: str, location: str,
+                             description: str) -> List[Classification]:
+        combined_text = title + ' ' + description
+
+        # Each field is scanned at most once, shared by every profile, and
+        # only when some profile still undecided needs it
+        location_hits = {k for group in self._locations.scan(location) for k in group}
+        title_hits = None
+        experience_groups = None
+
+        results = []
+        for locations, titles, experience in self._rules:
+            if locations is not None and location_hits.isdisjoint(locations):
+                results.append(REJECT_LOCATION)
+                continue
+            if titles is not None:
+                if title_hits is None:
+                    title_hits = {k for group in self._titles.scan(title) for k in group}
+                if title_hits.isdisjoint(titles):
+                    results.append(REJECT_TITLE)
+                    continue
+            if experience is None:
+                results.append(NO_EXPERIENCE_RULE)
+                continue
+            if experience_groups is None:
+                experience_groups = self._scan_experience(combined_text)
+            hit = _first_hit(experience_groups, experience)
+            if hit:
+                results.append((True, 'experience', f"matched '{hit.strip()}'"))
+            elif not ('experience' in combined_text or 'year' in combined_text):
+                results.append(NO_EXPERIENCE_REQUIREMENT)
+            else:
+                results.append(REJECT_EXPERIENCE)
+        return results
+
+
+def combine(results: List[Classification]) -> Classification:
+    """
+    Overall decision across profiles: kept if any profile keeps it, with the
+    first keeping profile's rule and reason (else the first profile's)
+    """
+    for result in results:
+        if result[0]:
+            return result
+    return results[0]
+
+
+def load_profiles() -> Dict[str, Dict]:
+    """PROFILES from sources_config.py, falling back to DEFAULT_PROFILES"""
+    try:
+        import sources_config
+    except ImportError:
+        return DEFAULT_PROFILES
+    return getattr(sources_config, 'PROFILES', None) or DEFAULT_PROFILES
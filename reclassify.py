@@ -0,0 +1,155 @@
+"""
+Bulk Reclassification
+Re-applies the current filter profiles to every job already stored in
+jobs.db, recording which rule kept or rejected each job and why
+
+Usage: python reclassify.py [--chunk-size 50000] [--dry-run]
+"""
+
+import os
+import time
+import sqlite3
+import argparse
+from collections import Counter
+from datetime import datetime
+from typing import Dict
+
+from profiles import ProfileMatcher, combine, load_profiles
+from schema import migrate
+
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'jobs.db')
+CHUNK_SIZE = 50000
+
+
+def reclassify(db_path: str = DATABASE_PATH, chunk_size: int = CHUNK_SIZE,
+               dry_run: bool = False, profiles: Dict = None) -> Dict:
+    """
+    Stream the jobs table in id order and store a fresh classification
+
+    Each chunk is read as columns and classified against every profile at
+    once with ProfileMatcher.classify_columns, which scans each field
+    column-wise. The jobs table keeps the combined decision (kept if any
+    profile keeps the job) and job_profiles the per-profile results; only
+    rows that changed are written, one transaction per chunk, and each
+    changed job adds a single change log entry however many of its profile
+    rows changed. Results for profiles no longer configured are removed.
+
+    Returns:
+        Dictionary with scanned/changed counts, per-rule tallies and timing
+    """
+    matcher = ProfileMatcher(profiles or load_profiles())
+    names = matcher.profile_names
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+
+    start = time.perf_counter()
+    classified_at = datetime.now().isoformat()
+    scanned = 0
+    changed = 0
+    profiles_changed = 0
+    tally = Counter()
+    profile_tally = Counter()
+    last_id = 0
+
+    try:
+        placeholders = ', '.join('?' for _ in names)
+        stale = conn.execute(
+            f'SELECT COUNT(*) FROM job_profiles WHERE profile NOT IN ({placeholders})',
+            names).fetchone()[0]
+        if stale and not dry_run:
+            with conn:
+                conn.execute(f'DELETE FROM job_profiles WHERE profile NOT IN ({placeholders})',
+                             names)
+
+        while True:
+            rows = conn.execute('''
+                SELECT id, job_id, title, location, description,
+                       filter_decision, filter_rule, filter_reason
+                FROM jobs WHERE id > ? ORDER BY id LIMIT ?
+            ''', (last_id, chunk_size)).fetchall()
+            if not rows:
+                break
+
+            ids, job_ids, titles, locations, descriptions, decisions, rules, reasons = zip(*rows)
+            results = matcher.classify_columns(titles, locations, descriptions)
+
+            stored = {(job_id, profile): (decision, rule, reason)
+                      for job_id, profile, decision, rule, reason in conn.execute('''
+                          SELECT p.job_id, p.profile, p.decision, p.rule, p.reason
+                          FROM jobs j JOIN job_profiles p ON p.job_id = j.job_id
+                          WHERE j.id >= ? AND j.id <= ?
+                      ''', (ids[0], ids[-1]))}
+
+            updates = []
+            profile_updates = []
+            for row_id, job_id, old_decision, old_rule, old_reason, job_results in zip(
+                    ids, job_ids, decisions, rules, reasons, results):
+                for name, (keep, rule, reason) in zip(names, job_results):
+                    decision = 'keep' if keep else 'reject'
+                    profile_tally[(name, decision)] += 1
+                    if stored.get((job_id, name)) != (decision, rule, reason):
+                        profile_updates.append((job_id, name, decision, rule, reason))
+
+                keep, rule, reason = combine(job_results)
+                decision = 'keep' if keep else 'reject'
+                tally[(decision, rule)] += 1
+                if (decision, rule, reason) != (old_decision, old_rule, old_reason):
+                    updates.append((decision, rule, reason, classified_at, row_id))
+
+            if (updates or profile_updates) and not dry_run:
+                with conn:
+                    conn.executemany('''
+                        UPDATE jobs SET filter_decision = ?, filter_rule = ?,
+                               filter_reason = ?, classified_at = ?
+                        WHERE id = ?
+                    ''', updates)
+                    conn.executemany('''
+                        INSERT OR REPLACE INTO job_profiles
+                        (job_id, profile, decision, rule, reason)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', profile_updates)
+
+            scanned += len(rows)
+            changed += len(updates)
+            profiles_changed += len(profile_updates)
+            last_id = ids[-1]
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'scanned': scanned,
+        'changed': changed,
+        'profiles_changed': profiles_changed,
+        'profiles_removed': stale,
+        'tally': dict(tally),
+        'profile_tally': dict(profile_tally),
+        'elapsed': elapsed,
+        'rows_per_second': scanned / elapsed if elapsed else 0,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-apply filter profiles to stored jobs')
+    parser.add_argument('--db', default=DATABASE_PATH, help='Database path')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='Rows classified per batch/transaction')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report what would change without writing')
+    args = parser.parse_args()
+
+    result = reclassify(args.db, args.chunk_size, args.dry_run)
+
+    print(f"\n{'='*60}")
+    print(f"Reclassification {'(dry run) ' if args.dry_run else ''}Complete")
+    print(f"{'='*60}")
+    print(f"Jobs scanned: {result['scanned']}")
+    print(f"Classifications changed: {result['changed']}")
+    for (decision, rule), count in sorted(result['tally'].items()):
+        print(f"  {decision:<7} by {rule:<11} {count}")
+    print(f"Profile results changed: {result['profiles_changed']} "
+          f"({result['profiles_removed']} for removed profiles)")
+    for (profile, decision), count in sorted(result['profile_tally'].items()):
+        print(f"  {profile:<20} {decision:<7} {count}")
+    print(f"Time: {result['elapsed']:.1f}s ({result['rows_per_second']:,.0f} rows/s)")
+    print(f"{'='*60}")
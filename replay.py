@@ -0,0 +1,197 @@
+"""
+Offline Replay
+Re-runs Gemini extraction and profile filtering over listing pages kept in
+the raw page store (RAW_PAGE_DIR), without fetching anything from the career
+sites - for iterating on the extraction prompt or backfilling jobs
+
+Usage: python replay.py [--days 7] [--company Amazon] [--all-versions] [--dry-run]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from page_store import PageStore, RAW_PAGE_DIR
+from profiles import ProfileMatcher, load_profiles
+from schema import migrate
+
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'jobs.db')
+ARCHIVE_DATABASE_PATH = os.getenv('ARCHIVE_DATABASE_PATH', 'jobs_archive.db')
+REPLAY_WORKERS = int(os.getenv('REPLAY_WORKERS', 8))
+
+
+def select_pages(conn: sqlite3.Connection, days: Optional[int] = None,
+                 company: Optional[str] = None, all_versions: bool = False) -> List[tuple]:
+    """
+    Stored pages to replay, in listing/page order
+
+    By default only the latest stored content of each page URL is used;
+    all_versions replays every distinct version ever stored.
+    """
+    query = '''
+        SELECT url, sha256, listing_url, company, source_category, page_index,
+               first_seen_ts
+        FROM raw_pages r WHERE 1=1
+    '''
+    params = []
+    if days is not None:
+        query += ' AND last_seen_ts >= ?'
+        params.append(int(time.time()) - days * 86400)
+    if company:
+        query += ' AND company = ?'
+        params.append(company)
+    if not all_versions:
+        query += ' AND last_seen_ts = (SELECT MAX(last_seen_ts) FROM raw_pages WHERE url = r.url)'
+    query += ' ORDER BY listing_url, page_index, last_seen_ts'
+    return conn.execute(query, params).fetchall()
+
+
+def stored_postings(conn: sqlite3.Connection,
+                    archive_path: str = ARCHIVE_DATABASE_PATH) -> Tuple[Set[str], Set[str]]:
+    """
+    Fingerprints of every posting in jobs.db (open or closed) and job ids
+    of every archived posting, which replay must not bring back
+    """
+    fingerprints = {row[0] for row in conn.execute(
+        'SELECT fingerprint FROM jobs WHERE fingerprint IS NOT NULL')}
+    archived = set()
+    if archive_path and os.path.exists(archive_path):
+        archive = sqlite3.connect(archive_path)
+        try:
+            archived = {row[0] for row in archive.execute('SELECT job_id FROM jobs_archive')}
+        except sqlite3.OperationalError:
+            pass  # archive created but never written
+        finally:
+            archive.close()
+    return fingerprints, archived
+
+
+def replay(db_path: str = DATABASE_PATH, store_dir: str = RAW_PAGE_DIR,
+           days: Optional[int] = None, company: Optional[str] = None,
+           all_versions: bool = False, workers: int = REPLAY_WORKERS,
+           dry_run: bool = False, archive_path: str = ARCHIVE_DATABASE_PATH) -> Dict:
+    """
+    Extract and filter stored pages in parallel, saving newly found jobs
+
+    Pages are read from local disk, so the run is bound only by extraction.
+    Jobs are deduplicated by fingerprint across pages and versions and dated
+    by when their page was first stored, not by the replay. Postings already
+    in jobs.db (including closed ones) or in the archive are skipped, so
+    only postings never saved before are added. Crawl bookkeeping (last
+    seen, closures, diffs) is left alone, since replayed pages say nothing
+    about the sites today.
+
+    Returns:
+        Dictionary with page/job counts, per-company kept counts and timing
+    """
+    from gemini_scraper import GeminiJobScraper, save_jobs_to_db
+
+    if not store_dir:
+        raise ValueError('No raw page store configured; set RAW_PAGE_DIR')
+
+    store = PageStore(store_dir)
+    scraper = GeminiJobScraper()
+    profile_matcher = ProfileMatcher(load_profiles())
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate(conn)
+        pages = select_pages(conn, days, company, all_versions)
+        stored, archived = stored_postings(conn, archive_path)
+    finally:
+        conn.close()
+
+    start = time.perf_counter()
+    missing = failed = 0
+
+    def extract(page):
+        _, digest, listing_url, page_company, source_category, _, first_seen_ts = page
+        try:
+            page_html = store.get(digest)
+        except FileNotFoundError:
+            return None
+        # Same base URL as the crawler, so fallback job URLs and fingerprints match
+        page_jobs = scraper.extract_jobs_with_gemini(page_html, page_company,
+                                                     source_category, listing_url)
+        scraped_date = sys.intern(datetime.fromtimestamp(first_seen_ts).isoformat())
+        for job in page_jobs:
+            job.scraped_date = scraped_date
+        return page_jobs
+
+    jobs = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for page_jobs in pool.map(extract, pages):
+            if page_jobs is None:
+                missing += 1
+                continue
+            if not page_jobs.complete:
+                failed += 1
+            for job in page_jobs:
+                # Keep the earliest sighting when several page versions hold it
+                earlier = jobs.get(job.fingerprint)
+                if earlier is None or job.scraped_date < earlier.scraped_date:
+                    jobs[job.fingerprint] = job
+
+    new_jobs = [job for job in jobs.values()
+                if job.fingerprint not in stored and job.job_id not in archived]
+    kept_jobs = [job for job in new_jobs if profile_matcher.apply(job)]
+    inserted = 0 if dry_run else save_jobs_to_db(kept_jobs, db_path)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'pages': len(pages),
+        'missing': missing,
+        'failed': failed,
+        'extracted': len(jobs),
+        'already_stored': len(jobs) - len(new_jobs),
+        'kept': len(kept_jobs),
+        'inserted': inserted,
+        'by_company': dict(Counter(job.company for job in kept_jobs)),
+        'elapsed': elapsed,
+        'pages_per_second': len(pages) / elapsed if elapsed else 0,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-run extraction over stored raw pages (no crawling)')
+    parser.add_argument('--db', default=DATABASE_PATH, help='Database path')
+    parser.add_argument('--store', default=RAW_PAGE_DIR, help='Raw page store directory')
+    parser.add_argument('--archive', default=ARCHIVE_DATABASE_PATH,
+                        help='Archive database (archived postings are not re-added)')
+    parser.add_argument('--days', type=int, default=None,
+                        help='Only pages seen in the last N days')
+    parser.add_argument('--company', default=None, help='Only this company')
+    parser.add_argument('--all-versions', action='store_true',
+                        help='Replay every stored version of each page, not just the latest')
+    parser.add_argument('--workers', type=int, default=REPLAY_WORKERS,
+                        help='Pages extracted in parallel')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report what would be saved without writing')
+    args = parser.parse_args()
+
+    try:
+        result = replay(args.db, args.store, args.days, args.company,
+                        args.all_versions, args.workers, args.dry_run, args.archive)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"\n{'='*60}")
+    print(f"Replay {'(dry run) ' if args.dry_run else ''}Complete")
+    print(f"{'='*60}")
+    print(f"Pages replayed: {result['pages']} ({result['missing']} missing from store, "
+          f"{result['failed']} failed or truncated extractions)")
+    print(f"Jobs extracted: {result['extracted']} "
+          f"({result['already_stored']} already stored or archived)")
+    print(f"Jobs after filtering: {result['kept']}")
+    for company, count in sorted(result['by_company'].items()):
+        print(f"  {company:<30} {count}")
+    print(f"New jobs saved: {result['inserted']}")
+    print(f"Time: {result['elapsed']:.1f}s ({result['pages_per_second']:,.1f} pages/s)")
+    print(f"{'='*60}")
@@ -0,0 +1,276 @@
+"""
+Data Retention & Compaction
+Moves stale or rejected jobs out of the hot database into a compressed
+archive database, then reclaims free pages and refreshes query statistics
+"""
+
+import os
+import sqlite3
+import json
+import zlib
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict
+from schema import migrate
+from sync import prune_change_log
+from crawler import prune_fingerprints
+from job_diff import FULL_CRAWL_DAYS
+from page_store import get_page_store, prune_pages
+
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'jobs.db')
+ARCHIVE_DATABASE_PATH = os.getenv('ARCHIVE_DATABASE_PATH', 'jobs_archive.db')
+RETENTION_DAYS = int(os.getenv('RETENTION_DAYS', 30))
+
+# Jobs the user has acted on stay in the hot DB regardless of age
+KEEP_STATUSES = ('applied',)
+
+BATCH_SIZE = 500
+
+
+def _db_size(conn: sqlite3.Connection, schema: str = 'main') -> int:
+    """Return the size in bytes of an open database (or attached schema)"""
+    page_count = conn.execute(f'PRAGMA {schema}.page_count').fetchone()[0]
+    page_size = conn.execute(f'PRAGMA {schema}.page_size').fetchone()[0]
+    return page_count * page_size
+
+
+def _init_archive(conn: sqlite3.Connection):
+    """Create the archive table in the attached archive database"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive.jobs_archive (
+            job_id TEXT PRIMARY KEY,
+            company TEXT NOT NULL,
+            source_category TEXT NOT NULL,
+            status TEXT,
+            scraped_date TEXT NOT NULL,
+            archived_at TEXT NOT NULL,
+            payload BLOB NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS archive.idx_archive_company
+        ON jobs_archive(company)
+    ''')
+
+
+def archive_stale_jobs(conn: sqlite3.Connection, days: int = RETENTION_DAYS,
+                       dry_run: bool = False) -> int:
+    """
+    Move expired jobs into the attached archive database
+
+    A job is expired when it was last seen by the scraper more than `days`
+    ago or the user marked it rejected. Open postings of a company whose
+    latest run stopped early are kept, since pages past the stop were never
+    looked at and their postings may still be live, but only for another
+    FULL_CRAWL_DAYS: by then a full crawl should have seen or closed them,
+    and a listing that never completes (e.g. capped by max_pages) must not
+    keep its postings forever. Rejected jobs leave a tombstone in the hot DB
+    so the scraper doesn't re-add the still-listed posting as pending. Each
+    row is stored as zlib-compressed JSON so the archive stays small while
+    remaining fully restorable. The archive is cumulative, so the same file
+    must be kept across runs (the GitHub workflow carries it in the Actions
+    cache like jobs.db).
+
+    Returns:
+        Number of jobs archived (or that would be archived on a dry run)
+    """
+    cutoff = int((datetime.now() - timedelta(days=days)).timestamp())
+    grace_cutoff = cutoff - FULL_CRAWL_DAYS * 86400
+    placeholders = ', '.join('?' for _ in KEEP_STATUSES)
+    # Companies whose latest run (within the window) was incomplete; SQLite
+    # takes `complete` from the row holding MAX(run_ts)
+    partially_crawled = '''
+        SELECT company FROM (
+            SELECT company, MAX(run_ts) AS run_ts, complete
+            FROM main.company_diffs GROUP BY company
+        ) WHERE run_ts >= ? AND complete = 0
+    '''
+    where = f'''
+        (status = 'rejected' OR (
+            COALESCE(last_seen_ts, scraped_ts) < ?
+            AND (closed_ts IS NOT NULL OR company NOT IN ({partially_crawled})
+                 OR COALESCE(last_seen_ts, scraped_ts) < ?)
+        ))
+        AND status NOT IN ({placeholders})
+    '''
+    params = [cutoff, cutoff, grace_cutoff, *KEEP_STATUSES]
+
+    if dry_run:
+        return conn.execute(f'SELECT COUNT(*) FROM main.jobs WHERE {where}',
+                            params).fetchone()[0]
+
+    archived_at = datetime.now().isoformat()
+    archived_ts = int(datetime.now().timestamp())
+    archived = 0
+    while True:
+        cursor = conn.execute(
+            f'SELECT * FROM main.jobs WHERE {where} LIMIT {BATCH_SIZE}', params
+        )
+        columns = [col[0] for col in cursor.description]
+        rows = cursor.fetchall()
+        if not rows:
+            break
+
+        records = []
+        tombstones = []
+        for row in rows:
+            job = dict(zip(columns, row))
+            payload = zlib.compress(json.dumps(job, default=str).encode('utf-8'))
+            records.append((job['job_id'], job['company'], job['source_category'],
+                            job['status'], job['scraped_date'], archived_at, payload))
+            if job['status'] == 'rejected':
+                tombstones.append((job['job_id'], job['fingerprint'], job['company'],
+                                   archived_ts))
+
+        # Insert + delete in one transaction so a row is never lost or duplicated
+        with conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO archive.jobs_archive
+                (job_id, company, source_category, status, scraped_date,
+                 archived_at, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', records)
+            conn.executemany('''
+                INSERT OR REPLACE INTO main.job_tombstones
+                (job_id, fingerprint, company, archived_ts)
+                VALUES (?, ?, ?, ?)
+            ''', tombstones)
+            conn.executemany('DELETE FROM main.jobs WHERE job_id = ?',
+                             [(record[0],) for record in records])
+        archived += len(records)
+
+    return archived
+
+
+def prune_tombstones(conn: sqlite3.Connection, cutoff_ts: int) -> int:
+    """
+    Drop tombstones of postings that are no longer listed
+
+    Runs after prune_fingerprints: once a fingerprint is forgotten the
+    posting hasn't been extracted for the whole retention window, so if it
+    ever shows up again it counts as a new posting. Tombstones younger than
+    `cutoff_ts` are always kept.
+
+    Returns:
+        Number of tombstones removed
+    """
+    with conn:
+        return conn.execute('''
+            DELETE FROM main.job_tombstones
+            WHERE archived_ts < ? AND (fingerprint IS NULL OR fingerprint NOT IN (
+                SELECT fingerprint FROM main.job_fingerprints))
+        ''', (cutoff_ts,)).rowcount
+
+
+def compact_database(conn: sqlite3.Connection) -> int:
+    """
+    Reclaim free pages and refresh planner statistics
+
+    The first run switches the database to incremental auto-vacuum (which
+    requires one full VACUUM); later runs release the whole freelist.
+
+    Returns:
+        Bytes reclaimed (measured before ANALYZE adds its statistics pages)
+    """
+    size_before = _db_size(conn)
+
+    auto_vacuum = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+    if auto_vacuum != 2:  # 2 = INCREMENTAL
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+    else:
+        # incremental_vacuum frees one page per step, so run it to completion
+        # (executescript steps the pragma until it finishes)
+        conn.commit()
+        conn.executescript('PRAGMA incremental_vacuum;')
+
+    # Switching to incremental mode adds pointer-map pages, so the first
+    # VACUUM of a database with nothing to free can grow it slightly
+    reclaimed = max(0, size_before - _db_size(conn))
+
+    conn.execute('ANALYZE')
+    conn.commit()
+
+    return reclaimed
+
+
+def run_retention(db_path: str = DATABASE_PATH,
+                  archive_path: str = ARCHIVE_DATABASE_PATH,
+                  days: int = RETENTION_DAYS,
+                  dry_run: bool = False) -> Dict:
+    """
+    Archive expired jobs, prune crawl bookkeeping and compact the hot database
+
+    Fingerprints of postings not extracted within `days` (and tombstones of
+    rejected postings among them) and raw page index rows not seen within
+    `days` are dropped too (with their blobs in the RAW_PAGE_DIR store, if
+    one is configured), so those tables stop growing
+    with every posting and page ever crawled.
+
+    Returns:
+        Dictionary with archived count, remaining count, pruned change log
+        entries, fingerprints, tombstones and pages, and bytes reclaimed
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate(conn)
+        conn.execute('ATTACH DATABASE ? AS archive', (archive_path,))
+        _init_archive(conn)
+        conn.commit()
+
+        archived = archive_stale_jobs(conn, days, dry_run)
+        pruned = 0 if dry_run else prune_change_log(conn)
+        cutoff = datetime.now() - timedelta(days=days)
+        fingerprints_pruned = 0 if dry_run else prune_fingerprints(conn, cutoff)
+        tombstones_pruned = 0 if dry_run else prune_tombstones(
+            conn, int(cutoff.timestamp()))
+        pages_pruned, blobs_deleted = (0, 0) if dry_run else prune_pages(
+            conn, int(cutoff.timestamp()), get_page_store())
+        reclaimed = 0 if dry_run else compact_database(conn)
+        remaining = conn.execute('SELECT COUNT(*) FROM main.jobs').fetchone()[0]
+        archive_total = conn.execute(
+            'SELECT COUNT(*) FROM archive.jobs_archive'
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+    return {
+        'archived': archived,
+        'changes_pruned': pruned,
+        'fingerprints_pruned': fingerprints_pruned,
+        'tombstones_pruned': tombstones_pruned,
+        'pages_pruned': pages_pruned,
+        'blobs_deleted': blobs_deleted,
+        'remaining': remaining,
+        'archive_total': archive_total,
+        'reclaimed_bytes': reclaimed,
+        'db_size_bytes': os.path.getsize(db_path),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Archive stale jobs and compact jobs.db')
+    parser.add_argument('--days', type=int, default=RETENTION_DAYS,
+                        help='Archive jobs not seen for this many days')
+    parser.add_argument('--db', default=DATABASE_PATH, help='Hot database path')
+    parser.add_argument('--archive', default=ARCHIVE_DATABASE_PATH,
+                        help='Archive database path')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Only report how many jobs would be archived')
+    args = parser.parse_args()
+
+    result = run_retention(args.db, args.archive, args.days, args.dry_run)
+
+    print(f"\n{'='*60}")
+    print(f"Retention {'(dry run) ' if args.dry_run else ''}Complete")
+    print(f"{'='*60}")
+    print(f"Jobs archived: {result['archived']}")
+    print(f"Jobs remaining: {result['remaining']}")
+    print(f"Jobs in archive: {result['archive_total']}")
+    print(f"Change log entries pruned: {result['changes_pruned']}")
+    print(f"Fingerprints pruned: {result['fingerprints_pruned']}")
+    print(f"Tombstones pruned: {result['tombstones_pruned']}")
+    print(f"Raw pages pruned: {result['pages_pruned']} ({result['blobs_deleted']} files deleted)")
+    print(f"Space reclaimed: {result['reclaimed_bytes'] / 1024:.1f} KB")
+    print(f"Database size: {result['db_size_bytes'] / 1024:.1f} KB")
+    print(f"{'='*60}")
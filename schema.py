@@ -0,0 +1,377 @@
+"""
+Database Schema Migrations
+Versioned DDL for jobs.db. Migrations run once (from the scraper, the CLI
+tools or the gunicorn master) instead of on every web worker boot
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from typing import List, Tuple, Union
+
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'jobs.db')
+
+# (version, description, SQL script) - append only, never edit a shipped entry
+MIGRATIONS: List[Tuple[int, str, str]] = [
+    (1, 'jobs table', '''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT UNIQUE NOT NULL,
+            company TEXT NOT NULL,
+            title TEXT NOT NULL,
+            location TEXT,
+            url TEXT NOT NULL,
+            source_category TEXT NOT NULL,
+            description TEXT,
+            requirements TEXT,
+            posted_date TEXT,
+            scraped_date TEXT NOT NULL,
+            status TEXT DEFAULT 'pending',
+            match_score INTEGER,
+            gemini_analysis TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_source_category ON jobs(source_category);
+        CREATE INDEX IF NOT EXISTS idx_status ON jobs(status);
+        CREATE INDEX IF NOT EXISTS idx_company ON jobs(company);
+    '''),
+
+    (2, 'change log for delta sync', '''
+        CREATE TABLE IF NOT EXISTS job_changes (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL,
+            op TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_insert AFTER INSERT ON jobs
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (NEW.job_id, 'upsert');
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_update AFTER UPDATE ON jobs
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (NEW.job_id, 'upsert');
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_delete AFTER DELETE ON jobs
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (OLD.job_id, 'delete');
+        END;
+        -- Seed existing jobs so the first delta carries the full history
+        INSERT INTO job_changes (job_id, op)
+        SELECT job_id, 'upsert' FROM jobs
+        WHERE NOT EXISTS (SELECT 1 FROM job_changes);
+    '''),
+
+    (3, 'stored filter classification', '''
+        ALTER TABLE jobs ADD COLUMN filter_decision TEXT;
+        ALTER TABLE jobs ADD COLUMN filter_rule TEXT;
+        ALTER TABLE jobs ADD COLUMN filter_reason TEXT;
+        ALTER TABLE jobs ADD COLUMN classified_at TEXT;
+        CREATE INDEX IF NOT EXISTS idx_filter_decision ON jobs(filter_decision, filter_rule);
+    '''),
+
+    (4, 'job fingerprints', '''
+        ALTER TABLE jobs ADD COLUMN fingerprint TEXT;
+        CREATE INDEX IF NOT EXISTS idx_fingerprint ON jobs(fingerprint);
+        CREATE TABLE IF NOT EXISTS job_fingerprints (
+            fingerprint TEXT PRIMARY KEY,
+            company TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_fingerprints_company ON job_fingerprints(company);
+    '''),
+
+    (5, 'epoch date columns', '''
+        ALTER TABLE jobs ADD COLUMN scraped_ts INTEGER;
+        ALTER TABLE jobs ADD COLUMN posted_ts INTEGER;
+        -- Backfilling derived columns is not a change worth syncing
+        DROP TRIGGER IF EXISTS trg_jobs_update;
+        -- 'utc' treats the stored (local) time as local, like datetime.timestamp()
+        UPDATE jobs SET
+            scraped_ts = CAST(strftime('%s', scraped_date, 'utc') AS INTEGER),
+            posted_ts = CAST(strftime('%s', posted_date, 'utc') AS INTEGER);
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_update AFTER UPDATE ON jobs
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (NEW.job_id, 'upsert');
+        END;
+        CREATE INDEX IF NOT EXISTS idx_scraped_ts ON jobs(scraped_ts);
+        CREATE INDEX IF NOT EXISTS idx_posted_ts ON jobs(posted_ts);
+    '''),
+
+    (6, 'per-company diffs and job events', '''
+        ALTER TABLE jobs ADD COLUMN last_seen_ts INTEGER;
+        ALTER TABLE jobs ADD COLUMN closed_ts INTEGER;
+        DROP TRIGGER IF EXISTS trg_jobs_update;
+        UPDATE jobs SET last_seen_ts = scraped_ts;
+        -- Refreshing last_seen_ts every run must not put every job in the next
+        -- delta, so it is the one column left out of the change log trigger
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_update AFTER UPDATE OF
+            job_id, company, title, location, url, source_category, description,
+            requirements, posted_date, scraped_date, status, match_score,
+            gemini_analysis, filter_decision, filter_rule, filter_reason,
+            classified_at, fingerprint, scraped_ts, posted_ts, closed_ts
+        ON jobs
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (NEW.job_id, 'upsert');
+        END;
+        CREATE INDEX IF NOT EXISTS idx_company_open ON jobs(company, closed_ts);
+        CREATE TABLE IF NOT EXISTS company_diffs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company TEXT NOT NULL,
+            run_ts INTEGER NOT NULL,
+            added INTEGER NOT NULL,
+            removed INTEGER NOT NULL,
+            reopened INTEGER NOT NULL,
+            unchanged INTEGER NOT NULL,
+            complete INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_company_diffs_run ON company_diffs(run_ts);
+        CREATE TABLE IF NOT EXISTS job_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts INTEGER NOT NULL,
+            company TEXT NOT NULL,
+            job_id TEXT NOT NULL,
+            event TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_job_events_ts ON job_events(ts);
+    '''),
+
+    (7, 'per-profile filter results', '''
+        CREATE TABLE IF NOT EXISTS job_profiles (
+            job_id TEXT NOT NULL,
+            profile TEXT NOT NULL,
+            decision TEXT NOT NULL,
+            rule TEXT,
+            reason TEXT,
+            PRIMARY KEY (job_id, profile)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_job_profiles_profile ON job_profiles(profile, decision);
+        -- Stored classifications came from the rules the default profile keeps
+        INSERT OR IGNORE INTO job_profiles (job_id, profile, decision, rule, reason)
+            SELECT job_id, 'default', filter_decision, filter_rule, filter_reason
+            FROM jobs WHERE filter_decision IS NOT NULL;
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_delete_profiles AFTER DELETE ON jobs
+        BEGIN
+            DELETE FROM job_profiles WHERE job_id = OLD.job_id;
+        END;
+        -- Profile results travel with their job in the next delta
+        CREATE TRIGGER IF NOT EXISTS trg_job_profiles_insert AFTER INSERT ON job_profiles
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (NEW.job_id, 'upsert');
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_profiles_update AFTER UPDATE ON job_profiles
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (NEW.job_id, 'upsert');
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_profiles_delete AFTER DELETE ON job_profiles
+        WHEN EXISTS (SELECT 1 FROM jobs WHERE job_id = OLD.job_id)
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (OLD.job_id, 'upsert');
+        END;
+    '''),
+
+    (8, 'host health and url error history', '''
+        CREATE TABLE IF NOT EXISTS host_health (
+            host TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            failures INTEGER NOT NULL DEFAULT 0,
+            opens INTEGER NOT NULL DEFAULT 0,
+            opened_until INTEGER NOT NULL DEFAULT 0,
+            latencies TEXT,
+            last_error TEXT,
+            updated_ts INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS url_errors (
+            url TEXT PRIMARY KEY,
+            host TEXT NOT NULL,
+            failures INTEGER NOT NULL DEFAULT 0,
+            total_failures INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            last_failure_ts INTEGER,
+            last_success_ts INTEGER,
+            next_retry_ts INTEGER NOT NULL DEFAULT 0
+        );
+    '''),
+
+    (9, 'raw page index', '''
+        CREATE TABLE IF NOT EXISTS raw_pages (
+            url TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            listing_url TEXT NOT NULL,
+            company TEXT NOT NULL,
+            source_category TEXT NOT NULL,
+            page_index INTEGER NOT NULL,
+            first_seen_ts INTEGER NOT NULL,
+            last_seen_ts INTEGER NOT NULL,
+            PRIMARY KEY (url, sha256)
+        );
+        CREATE INDEX IF NOT EXISTS idx_raw_pages_seen ON raw_pages(last_seen_ts);
+    '''),
+
+    (10, 'sync source identity for log rows', '''
+        -- On a serving replica, appended log rows are keyed by the scraper
+        -- database they came from, so a recreated scraper DB (whose ids
+        -- restart at 1) can't collide with rows applied earlier
+        ALTER TABLE company_diffs ADD COLUMN source_id TEXT;
+        ALTER TABLE company_diffs ADD COLUMN source_row_id INTEGER;
+        ALTER TABLE job_events ADD COLUMN source_id TEXT;
+        ALTER TABLE job_events ADD COLUMN source_row_id INTEGER;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_company_diffs_source
+            ON company_diffs(source_id, source_row_id);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_job_events_source
+            ON job_events(source_id, source_row_id);
+    '''),
+
+    (11, 'one change log entry per job for profile results', '''
+        -- A job's profile rows are written together, so only the first of
+        -- them needs a change log entry: later ones find the newest entry is
+        -- already this job's unexported upsert (a reclassify used to log one
+        -- entry per profile row). Checking only the newest entry keeps the
+        -- triggers to primary key lookups.
+        DROP TRIGGER IF EXISTS trg_job_profiles_insert;
+        DROP TRIGGER IF EXISTS trg_job_profiles_update;
+        DROP TRIGGER IF EXISTS trg_job_profiles_delete;
+        CREATE TRIGGER IF NOT EXISTS trg_job_profiles_insert AFTER INSERT ON job_profiles
+        WHEN NOT EXISTS (
+            SELECT 1 FROM job_changes
+            WHERE version = (SELECT MAX(version) FROM job_changes)
+            AND job_id = NEW.job_id AND op = 'upsert'
+            AND version > COALESCE((SELECT value FROM sync_state
+                                    WHERE key = 'exported_version'), 0))
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (NEW.job_id, 'upsert');
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_profiles_update AFTER UPDATE ON job_profiles
+        WHEN NOT EXISTS (
+            SELECT 1 FROM job_changes
+            WHERE version = (SELECT MAX(version) FROM job_changes)
+            AND job_id = NEW.job_id AND op = 'upsert'
+            AND version > COALESCE((SELECT value FROM sync_state
+                                    WHERE key = 'exported_version'), 0))
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (NEW.job_id, 'upsert');
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_profiles_delete AFTER DELETE ON job_profiles
+        WHEN EXISTS (SELECT 1 FROM jobs WHERE job_id = OLD.job_id)
+        AND NOT EXISTS (
+            SELECT 1 FROM job_changes
+            WHERE version = (SELECT MAX(version) FROM job_changes)
+            AND job_id = OLD.job_id AND op = 'upsert'
+            AND version > COALESCE((SELECT value FROM sync_state
+                                    WHERE key = 'exported_version'), 0))
+        BEGIN
+            INSERT INTO job_changes (job_id, op) VALUES (OLD.job_id, 'upsert');
+        END;
+    '''),
+
+    (12, 'tombstones for archived rejected jobs', '''
+        -- Rejected jobs leave the hot DB at the next retention run, but the
+        -- posting usually stays live; the tombstone keeps the next crawl
+        -- from inserting it again as a new pending job
+        CREATE TABLE IF NOT EXISTS job_tombstones (
+            job_id TEXT PRIMARY KEY,
+            fingerprint TEXT,
+            company TEXT NOT NULL,
+            archived_ts INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_job_tombstones_company
+            ON job_tombstones(company, fingerprint);
+    '''),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the highest applied migration (0 for a fresh database)"""
+    try:
+        return conn.execute('SELECT MAX(version) FROM schema_version').fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return 0
+
+
+def _statements(script: str) -> List[str]:
+    """
+    Split a migration script into single statements
+
+    executescript() commits first and would release the write lock, so
+    migrations run statement by statement inside one transaction instead.
+    sqlite3.complete_statement keeps trigger bodies (BEGIN ... END) whole.
+    """
+    statements, pending = [], ''
+    for line in script.splitlines(keepends=True):
+        pending += line
+        if sqlite3.complete_statement(pending):
+            statements.append(pending.strip())
+            pending = ''
+    if pending.strip():
+        statements.append(pending.strip())
+    return statements
+
+
+def migrate(target: Union[str, sqlite3.Connection] = DATABASE_PATH) -> int:
+    """
+    Apply pending migrations to a database path or open connection
+
+    Already up-to-date databases cost a single SELECT, so this is safe to
+    call at the start of every command.
+
+    Returns:
+        Number of migrations applied
+    """
+    conn = sqlite3.connect(target) if isinstance(target, str) else target
+    try:
+        current = get_schema_version(conn)
+        if current >= SCHEMA_VERSION:
+            return 0
+
+        conn.commit()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )
+        ''')
+
+        applied = 0
+        for version, description, script in MIGRATIONS:
+            if version <= current:
+                continue
+            # Each migration and its version row commit together. Another
+            # process may have applied it since the version was read, so check
+            # again once the write lock is held.
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if version <= get_schema_version(conn):
+                    conn.rollback()
+                    continue
+                for statement in _statements(script):
+                    conn.execute(statement)
+                conn.execute('''
+                    INSERT INTO schema_version (version, description, applied_at)
+                    VALUES (?, ?, ?)
+                ''', (version, description, datetime.now().isoformat()))
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            applied += 1
+            print(f"Applied migration {version}: {description}")
+
+        return applied
+    finally:
+        if isinstance(target, str):
+            conn.close()
+
+
+if __name__ == '__main__':
+    db_path = DATABASE_PATH
+    applied = migrate(db_path)
+    conn = sqlite3.connect(db_path)
+    version = get_schema_version(conn)
+    conn.close()
+    print(f"{db_path}: schema version {version} ({applied} migrations applied)")
@@ -76,6 +76,18 @@ SOURCES = {
 }
 
 
+# Pagination (optional) - per company, keyed by the company name above.
+# Without an entry the crawler follows "next"/"load more" links it finds on
+# the page, up to MAX_PAGES (env, default 5) pages per URL.
+#   param/start/step: build page URLs directly (e.g. ?offset=0, 10, 20 ...)
+#   max_pages: page cap for this company
+PAGINATION = {
+    "Amazon": {"param": "offset", "start": 0, "step": 10, "max_pages": 10},
+    "Google": {"param": "page", "start": 1, "step": 1, "max_pages": 10},
+    "JPMorgan Chase": {"max_pages": 10},
+}
+
+
 # User profile for job matching (optional)
 USER_PROFILE = """
 Skills: Python, JavaScript, React, Machine Learning, Data Analysis
@@ -83,3 +95,24 @@ Experience: 3 years in software engineering
 Preferences: Remote or hybrid, focus on AI/ML roles
 Education: Bachelor's in Computer Science
 """
+
+# Filter profiles - every job is checked against all profiles in one pass and
+# saved if any profile keeps it; per-profile results are stored for
+# /api/jobs?profile=<name>. Each profile lists keywords for:
+#   locations:  location must contain one of these
+#   titles:     title must contain one of these
+#   experience: if the posting mentions experience/years, one of these must appear
+# A missing list skips that requirement. "@usa", "@tech" and "@entry_level"
+# expand to the built-in keyword sets in jobfilter.py.
+PROFILES = {
+    "default": {
+        "locations": ["@usa"],
+        "titles": ["@tech"],
+        "experience": ["@entry_level"],
+    },
+    # "remote_ml": {
+    #     "locations": ["remote", "anywhere", "work from home"],
+    #     "titles": ["machine learning", "ml engineer", "ai engineer", "data scientist"],
+    #     "experience": ["@entry_level", "senior"],
+    # },
+}
@@ -0,0 +1,375 @@
+"""
+Incremental Database Sync
+Every change to the jobs table is recorded in the job_changes log (see
+schema.py) so the scraper can export compact deltas and the web app can
+apply them, instead of shipping the whole jobs.db on every run
+"""
+
+import os
+import sys
+import secrets
+import sqlite3
+import gzip
+import json
+import argparse
+from datetime import datetime
+from typing import Dict, List
+from schema import migrate
+
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'jobs.db')
+
+DELTA_FORMAT = 'jobs-delta/2'
+READABLE_FORMATS = ('jobs-delta/1', DELTA_FORMAT)
+
+# Columns owned by the serving side (user actions, local ids) - never synced
+LOCAL_COLUMNS = ('id', 'status', 'match_score', 'gemini_analysis', 'created_at')
+
+# Append-only logs shipped by id cursor rather than through job_changes
+APPEND_ONLY_TABLES = ('company_diffs', 'job_events')
+
+# Replica-side columns identifying where an appended log row came from
+SOURCE_COLUMNS = ('source_id', 'source_row_id')
+
+
+def _current_version(conn: sqlite3.Connection) -> int:
+    # sqlite_sequence keeps counting after old change log rows are pruned
+    row = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'job_changes'"
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def _get_state(conn: sqlite3.Connection, key: str, default: int = 0) -> int:
+    row = conn.execute('SELECT value FROM sync_state WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else default
+
+
+def _set_state(conn: sqlite3.Connection, key: str, value: int):
+    conn.execute('INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)',
+                 (key, value))
+
+
+def _source_id(conn: sqlite3.Connection) -> str:
+    """
+    Random identity of this scraper database, created on first export
+
+    Versions restart at 1 when the database is recreated (e.g. the Actions
+    cache was evicted); the identity tells replicas that happened.
+    """
+    source_id = _get_state(conn, 'source_id', None)
+    if source_id is None:
+        # Prefixed so it never looks numeric to the INTEGER-affinity column
+        source_id = f'src-{secrets.token_hex(8)}'
+        _set_state(conn, 'source_id', source_id)
+    return source_id
+
+
+def export_delta(out_path: str, db_path: str = DATABASE_PATH,
+                 since: int = None, full: bool = False) -> Dict:
+    """
+    Write all job changes after version `since` to a gzipped JSON-lines file
+
+    Args:
+        out_path: Destination file (e.g. delta.jsonl.gz)
+        db_path: Scraper-side database
+        since: Change log version to start from (default: last export)
+        full: Export every current job instead of the change log
+
+    Returns:
+        Delta header with from/to versions and counts
+    """
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        migrate(conn)
+
+        to_version = _current_version(conn)
+        source_id = _source_id(conn)
+
+        # A database that never exported (new or recreated) ships everything,
+        # so replicas can switch over to it without a manual --full
+        if since is None and _get_state(conn, 'exported_version', None) is None:
+            full = True
+
+        if full:
+            from_version = 0
+            changes = [(row[0], 'upsert') for row in
+                       conn.execute('SELECT job_id FROM jobs')]
+        else:
+            from_version = _get_state(conn, 'exported_version') if since is None else since
+            # Only the latest operation per job matters
+            changes = conn.execute('''
+                SELECT job_id, op, MAX(version) FROM job_changes
+                WHERE version > ? AND version <= ?
+                GROUP BY job_id
+                ORDER BY MAX(version)
+            ''', (from_version, to_version)).fetchall()
+
+        header = {
+            'format': DELTA_FORMAT,
+            'source_id': source_id,
+            'from_version': from_version,
+            'to_version': to_version,
+            'full': full,
+            'created_at': datetime.now().isoformat(),
+            'upserts': 0,
+            'deletes': 0,
+            'appends': 0,
+        }
+
+        lines = []
+        for change in changes:
+            job_id, op = change[0], change[1]
+            if op == 'upsert':
+                row = conn.execute('SELECT * FROM jobs WHERE job_id = ?',
+                                   (job_id,)).fetchone()
+                if row is None:
+                    continue
+                job = {k: row[k] for k in row.keys() if k not in LOCAL_COLUMNS}
+                profiles = conn.execute('''
+                    SELECT profile, decision, rule, reason FROM job_profiles
+                    WHERE job_id = ?
+                ''', (job_id,)).fetchall()
+                lines.append({'op': 'upsert', 'job': job,
+                              'profiles': [list(p) for p in profiles]})
+                header['upserts'] += 1
+            else:
+                lines.append({'op': 'delete', 'job_id': job_id})
+                header['deletes'] += 1
+
+        append_cursors = {}
+        for table in APPEND_ONLY_TABLES:
+            last_id = 0 if full else _get_state(conn, f'exported_{table}_id')
+            for row in conn.execute(f'SELECT * FROM {table} WHERE id > ? ORDER BY id', (last_id,)):
+                row = {k: row[k] for k in row.keys() if k not in SOURCE_COLUMNS}
+                lines.append({'op': 'append', 'table': table, 'row': row})
+                header['appends'] += 1
+                last_id = row['id']
+            append_cursors[table] = last_id
+
+        with gzip.open(out_path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(header) + '\n')
+            for line in lines:
+                f.write(json.dumps(line) + '\n')
+
+        _set_state(conn, 'exported_version', to_version)
+        for table, last_id in append_cursors.items():
+            _set_state(conn, f'exported_{table}_id', last_id)
+        conn.commit()
+        return header
+    finally:
+        conn.close()
+
+
+def _read_delta(path: str):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('format') not in READABLE_FORMATS:
+            raise ValueError(f"{path} is not a {DELTA_FORMAT} file")
+        return header, [json.loads(line) for line in f if line.strip()]
+
+
+def apply_deltas(paths: List[str], db_path: str = DATABASE_PATH) -> Dict:
+    """
+    Apply delta files to the serving database in version order
+
+    Upserts never touch serving-side columns (status, match score, ...)
+    and replace the job's per-profile filter results, deletes skip jobs
+    the user has applied to, and diff/event log rows are appended keyed by
+    (source_id, scraper-side id). A full delta is a snapshot, so jobs it
+    doesn't contain are deleted too (again except applied ones). Deltas
+    that were already applied are skipped, including a full delta from the
+    current source that is no newer than the applied version; a gap in
+    versions, or an incremental delta from a different scraper database
+    than the last one applied, raises ValueError.
+    Deltas without a source_id (older exports) are applied as before.
+
+    Returns:
+        Dictionary with applied/skipped file counts and the new version
+    """
+    from retention import KEEP_STATUSES
+
+    deltas = sorted((_read_delta(path) for path in paths),
+                    key=lambda d: (not d[0]['full'], d[0]['from_version'],
+                                   d[0]['to_version']))
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate(conn)
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(jobs)')]
+        keep_placeholders = ', '.join('?' for _ in KEEP_STATUSES)
+
+        applied_version = _get_state(conn, 'applied_version')
+        applied_source = _get_state(conn, 'applied_source_id', None)
+        result = {'applied': 0, 'skipped': 0, 'upserts': 0, 'deletes': 0, 'appends': 0}
+
+        for header, lines in deltas:
+            source_id = header.get('source_id')
+            switched = bool(source_id) and source_id != applied_source
+            if switched:
+                if not header['full'] and applied_source is not None:
+                    raise ValueError(
+                        f"Delta comes from a different scraper database ({source_id}, "
+                        f"last applied {applied_source}); its versions can't be "
+                        f"compared - export a full delta with --full"
+                    )
+                # Switching source: versions start over from this delta
+                applied_version = 0
+                with conn:
+                    if applied_source is None:
+                        # Log rows applied before sources were tracked came from it
+                        for table in APPEND_ONLY_TABLES:
+                            conn.execute(f'''
+                                UPDATE {table} SET source_id = ?, source_row_id = id
+                                WHERE source_id IS NULL
+                            ''', (source_id,))
+                    applied_source = source_id
+                    _set_state(conn, 'applied_source_id', source_id)
+                    _set_state(conn, 'applied_version', 0)
+
+            # Job changes already applied are skipped; log appends are idempotent
+            # (and may be new even when no job changed), so they always apply.
+            # An older snapshot from the same source would roll rows back.
+            already_applied = not switched and header['to_version'] <= applied_version
+            if not header['full'] and not already_applied:
+                if header['from_version'] > applied_version:
+                    raise ValueError(
+                        f"Missing changes {applied_version}..{header['from_version']}; "
+                        f"export a full delta with --full"
+                    )
+
+            with conn:
+                # Changes made by applying a delta are not ours to re-export
+                log_start = _current_version(conn)
+                snapshot = header['full'] and not already_applied
+                if snapshot:
+                    conn.execute('CREATE TEMP TABLE IF NOT EXISTS snapshot_jobs '
+                                 '(job_id TEXT PRIMARY KEY)')
+                    conn.execute('DELETE FROM temp.snapshot_jobs')
+
+                for line in lines:
+                    if line['op'] == 'append':
+                        if line['table'] in APPEND_ONLY_TABLES:
+                            row = dict(line['row'])
+                            if source_id:
+                                # Local id; the scraper's id only dedupes
+                                row['source_row_id'] = row.pop('id')
+                                row['source_id'] = source_id
+                            conn.execute(f'''
+                                INSERT OR IGNORE INTO {line['table']} ({', '.join(row)})
+                                VALUES ({', '.join('?' for _ in row)})
+                            ''', list(row.values()))
+                            result['appends'] += 1
+                        continue
+
+                    if already_applied:
+                        continue
+
+                    if line['op'] == 'delete':
+                        conn.execute(
+                            f'DELETE FROM jobs WHERE job_id = ? '
+                            f'AND status NOT IN ({keep_placeholders})',
+                            (line['job_id'], *KEEP_STATUSES)
+                        )
+                        result['deletes'] += 1
+                        continue
+
+                    job = {k: v for k, v in line['job'].items()
+                           if k in columns and k not in LOCAL_COLUMNS}
+                    cols = list(job)
+                    updates = ', '.join(f'{c} = excluded.{c}' for c in cols if c != 'job_id')
+                    conn.execute(f'''
+                        INSERT INTO jobs ({', '.join(cols)})
+                        VALUES ({', '.join('?' for _ in cols)})
+                        ON CONFLICT(job_id) DO UPDATE SET {updates}
+                    ''', [job[c] for c in cols])
+                    if snapshot:
+                        conn.execute('INSERT OR IGNORE INTO temp.snapshot_jobs VALUES (?)',
+                                     (job['job_id'],))
+                    if 'profiles' in line:
+                        conn.execute('DELETE FROM job_profiles WHERE job_id = ?',
+                                     (job['job_id'],))
+                        conn.executemany('''
+                            INSERT INTO job_profiles (job_id, profile, decision, rule, reason)
+                            VALUES (?, ?, ?, ?, ?)
+                        ''', [(job['job_id'], *p) for p in line['profiles']])
+                    result['upserts'] += 1
+
+                if snapshot:
+                    # Jobs missing from the snapshot are gone on the scraper side
+                    result['deletes'] += conn.execute(
+                        f'DELETE FROM jobs WHERE job_id NOT IN '
+                        f'(SELECT job_id FROM temp.snapshot_jobs) '
+                        f'AND status NOT IN ({keep_placeholders})',
+                        KEEP_STATUSES
+                    ).rowcount
+
+                conn.execute('DELETE FROM job_changes WHERE version > ?', (log_start,))
+                if not already_applied:
+                    applied_version = header['to_version']
+                    _set_state(conn, 'applied_version', applied_version)
+
+            result['skipped' if already_applied else 'applied'] += 1
+
+        result['version'] = applied_version
+        return result
+    finally:
+        conn.close()
+
+
+def prune_change_log(conn: sqlite3.Connection) -> int:
+    """
+    Drop change log entries that have already been exported
+
+    A serving replica (which applies deltas but never exports) keeps no
+    change log at all.
+
+    Returns:
+        Number of change log rows removed
+    """
+    migrate(conn)
+    exported = conn.execute(
+        "SELECT value FROM sync_state WHERE key = 'exported_version'"
+    ).fetchone()
+    if exported:
+        cursor = conn.execute('DELETE FROM job_changes WHERE version <= ?', (exported[0],))
+    elif _get_state(conn, 'applied_version'):
+        cursor = conn.execute('DELETE FROM job_changes')
+    else:
+        return 0
+    conn.commit()
+    return cursor.rowcount
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export or apply jobs.db deltas')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Export changes since the last export')
+    export_parser.add_argument('--out', required=True, help='Output file (.jsonl.gz)')
+    export_parser.add_argument('--since', type=int, default=None,
+                               help='Change log version to start from')
+    export_parser.add_argument('--full', action='store_true',
+                               help='Export every job (to seed a new replica)')
+
+    apply_parser = subparsers.add_parser('apply', help='Apply delta files')
+    apply_parser.add_argument('files', nargs='+', help='Delta files (.jsonl.gz)')
+
+    for sub in (export_parser, apply_parser):
+        sub.add_argument('--db', default=DATABASE_PATH, help='Database path')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        header = export_delta(args.out, args.db, args.since, args.full)
+        print(f"Exported versions {header['from_version']}..{header['to_version']}: "
+              f"{header['upserts']} upserts, {header['deletes']} deletes, "
+              f"{header['appends']} log rows → {args.out}")
+    else:
+        try:
+            result = apply_deltas(args.files, args.db)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Applied {result['applied']} deltas ({result['skipped']} already applied): "
+              f"{result['upserts']} upserts, {result['deletes']} deletes, "
+              f"{result['appends']} log rows, now at version {result['version']}")